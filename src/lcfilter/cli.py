@@ -1,13 +1,18 @@
 """Command-line interface for lcfilter."""
 
+import os
+import queue
 import subprocess
 import sys
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import Annotated, BinaryIO, Callable, Iterable, Iterator, Optional
 
 import typer
 from rich.console import Console
-from rich.text import Text
 
 from . import __version__
 from .config_ignore import (
@@ -21,8 +26,8 @@ from .config_scope import (
     ScopeParseError,
 )
 from .filter_engine import FilterEngine, FilterStats
-from .parser_logcat import parse_logcat_line, LogcatStreamParser
-from .models import IgnoreConfig, ScopeConfig, LogLevel, RouteCategory
+from .parser_logcat import parse_logcat_line
+from .models import LEVELS_BY_CHAR, IgnoreConfig, LogEntry, ScopeConfig, LogLevel, RouteCategory
 from .stream_router import StreamRouter, RoutingConfig
 
 app = typer.Typer(
@@ -38,6 +43,22 @@ err_console = Console(stderr=True)
 DEFAULT_IGNORE_FILE = ".logcatignore"
 DEFAULT_SCOPE_FILE = ".logcatscope"
 
+# Chunks of adb output buffered between the reader thread and the router
+READ_QUEUE_SIZE = 1024
+
+# Most bytes of adb output taken from the pipe (and decoded) at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+# dry-run inputs of at least this many bytes are filtered in parallel
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+# Lines read into each chunk handed to a dry-run worker process
+PARALLEL_CHUNK_LINES = 16 * 1024
+
+# Chunks in flight per worker process, so uneven chunks still balance out
+# while only a bounded slice of the input is held in memory
+PARALLEL_CHUNKS_PER_WORKER = 4
+
 
 def version_callback(value: bool) -> None:
     """Print version and exit."""
@@ -173,23 +194,33 @@ def dry_run(
     # Create filter engine
     engine = FilterEngine(ignore_config=ignore_config, scope_config=scope_config)
     filter_stats = FilterStats() if stats else None
+    color = _use_color(color)
 
-    # Read and filter input file
+    # Read and filter input file, streaming it unless it is large enough
+    # to be worth splitting across processes
     try:
-        content = input_file.read_text(encoding="utf-8", errors="replace")
+        size = input_file.stat().st_size
+        handle = input_file.open(encoding="utf-8", errors="replace")
     except OSError as e:
         err_console.print(f"[red]Error reading input file:[/red] {e}")
         raise typer.Exit(1)
 
-    for line in content.splitlines():
-        entry = parse_logcat_line(line)
-        result = engine.filter_entry(entry)
-
-        if filter_stats:
-            filter_stats.record(result)
-
-        if result.should_display:
-            _print_entry(entry, color=color)
+    workers = _available_cpus()
+
+    with handle:
+        if size >= PARALLEL_MIN_BYTES and workers > 1:
+            chunks = _filter_in_parallel(
+                handle, ignore_config, scope_config, stats, workers
+            )
+            for raw_lines, level_chars, chunk_stats in chunks:
+                for raw_line, level_char in zip(raw_lines, level_chars):
+                    _print_line(raw_line, LEVELS_BY_CHAR.get(level_char), color)
+                if filter_stats:
+                    filter_stats.merge(chunk_stats)
+        else:
+            for entry in _iter_displayed(engine, handle, filter_stats):
+                _print_entry(entry, color=color)
+    _flush_stdout()
 
     # Print stats if requested
     if filter_stats:
@@ -280,16 +311,15 @@ def monitor(
         lcfilter monitor --in-scope=app.log --noise=/dev/null
         lcfilter monitor -- -s MyTag:*
     """
-    # Load config files (unless raw mode)
-    ignore_config = None
-    scope_config = None
+    # Load config files and create the filter engine (unless raw mode,
+    # which never consults them)
+    engine: FilterEngine | None = None
 
     if not raw:
-        ignore_config = _load_ignore_config(ignore_file)
-        scope_config = _load_scope_config(scope_file)
-
-    # Create filter engine
-    engine = FilterEngine(ignore_config=ignore_config, scope_config=scope_config)
+        engine = FilterEngine(
+            ignore_config=_load_ignore_config(ignore_file),
+            scope_config=_load_scope_config(scope_file),
+        )
 
     # Build adb command
     cmd = ["adb", "logcat"]
@@ -313,50 +343,230 @@ def monitor(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,  # Line buffered
         )
     except FileNotFoundError:
         err_console.print("[red]Error:[/red] adb not found. Is it installed and in PATH?")
         raise typer.Exit(1)
 
-    # Set up routing
-    routing_config = RoutingConfig.from_options(
-        in_scope=in_scope_output,
-        ignored=ignored_output,
-        noise=noise_output,
-    )
+    color = _use_color(color)
 
     try:
         assert process.stdout is not None
 
-        if raw:
+        if engine is None:
             # Raw mode: bypass routing, print everything to stdout
-            for line in process.stdout:
+            for line in _read_in_background(process.stdout, on_idle=_flush_stdout):
                 entry = parse_logcat_line(line)
                 _print_entry(entry, color=color)
         else:
-            # Normal mode: route to three streams
-            with StreamRouter(routing_config) as router:
-                for line in process.stdout:
-                    entry = parse_logcat_line(line)
-                    result = engine.route_entry(entry)
-
-                    # Write to appropriate stream
-                    if color and _is_stdout_stream(result.category, routing_config):
-                        # Use colored output for stdout streams
-                        _print_entry_to_category(entry, result.category, routing_config, color=True)
-                    else:
-                        # Plain output for file streams
-                        router.write(result.category, entry.raw_line)
+            # Normal mode: route to three streams, flushing whenever adb
+            # goes quiet so batched output is never left sitting. Output is
+            # written on its own thread, so a slow terminal or disk does
+            # not stall filtering.
+            routing_config = RoutingConfig.from_options(
+                in_scope=in_scope_output,
+                ignored=ignored_output,
+                noise=noise_output,
+            )
+            with StreamRouter(routing_config, background_writes=True) as router:
+
+                def flush_output() -> None:
+                    # Hand the flush to the writer thread rather than
+                    # waiting on the destinations; stdout is only flushed
+                    # here when colored lines are printed to it directly
+                    router.flush(wait=False)
+                    if color:
+                        _flush_stdout()
+
+                lines = _read_in_background(process.stdout, on_idle=flush_output)
+                _route_lines(lines, engine, router, color=color)
 
     except KeyboardInterrupt:
         err_console.print("\n[dim]Interrupted.[/dim]")
     finally:
+        _flush_stdout()
         process.terminate()
         process.wait()
 
 
+def _available_cpus() -> int:
+    """Number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _iter_displayed(
+    engine: FilterEngine, lines: Iterable[str], stats: FilterStats | None
+) -> Iterator[LogEntry]:
+    """Parse and filter lines, yielding the entries to display in order."""
+    entries = map(parse_logcat_line, lines)
+    if stats is None:
+        yield from engine.filter_and_yield_visible(entries)
+        return
+
+    record = stats.record
+    for result in engine.filter_entries(entries):
+        record(result)
+        if result.should_display:
+            yield result.entry
+
+
+# Filter engine of a dry-run worker process, built once by its initializer
+_worker_engine: FilterEngine | None = None
+_worker_stats: bool = False
+
+
+def _init_filter_worker(
+    ignore_config: IgnoreConfig, scope_config: ScopeConfig, stats: bool
+) -> None:
+    """Build a worker's filter engine from the configs the parent loaded."""
+    global _worker_engine, _worker_stats
+
+    _worker_engine = FilterEngine(
+        ignore_config=ignore_config, scope_config=scope_config
+    )
+    _worker_stats = stats
+
+
+def _filter_chunk(
+    lines: list[str],
+) -> tuple[list[str], str, FilterStats | None]:
+    """Filter one chunk of lines in a worker process.
+
+    Only what printing needs crosses back to the parent, as columns: the
+    raw lines and a string of their level letters (a space when the line
+    has no level). Pickling LogEntry objects would cost far more than
+    filtering them did.
+    """
+    assert _worker_engine is not None
+    stats = FilterStats() if _worker_stats else None
+    raw_lines: list[str] = []
+    level_chars: list[str] = []
+    for entry in _iter_displayed(_worker_engine, lines, stats):
+        raw_lines.append(entry.raw_line)
+        level_chars.append(entry.level.value if entry.level else " ")
+    return raw_lines, "".join(level_chars), stats
+
+
+def _filter_in_parallel(
+    lines: Iterable[str],
+    ignore_config: IgnoreConfig,
+    scope_config: ScopeConfig,
+    stats: bool,
+    workers: int,
+) -> Iterator[tuple[list[str], str, FilterStats | None]]:
+    """Filter lines across worker processes, yielding results in input order.
+
+    Lines are independent, so the input is read in contiguous chunks of
+    PARALLEL_CHUNK_LINES and handed out as it is read. At most a few
+    chunks per worker are in flight, so memory stays bounded however
+    large the input is. The configs are pickled to each worker once, by
+    its initializer (IgnoreConfig rebuilds its derived matchers there).
+    """
+    chunks = iter(lambda: list(islice(lines, PARALLEL_CHUNK_LINES)), [])
+    max_in_flight = workers * PARALLEL_CHUNKS_PER_WORKER
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_filter_worker,
+        initargs=(ignore_config, scope_config, stats),
+    ) as executor:
+        in_flight: deque[Future] = deque()
+        for chunk in chunks:
+            in_flight.append(executor.submit(_filter_chunk, chunk))
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def _read_in_background(
+    stream: BinaryIO,
+    maxsize: int = READ_QUEUE_SIZE,
+    on_idle: Callable[[], None] | None = None,
+) -> Iterator[str]:
+    """Drain a stream on a reader thread and yield its lines.
+
+    The reader thread only moves input into a bounded queue, so adb's
+    stdout pipe keeps draining while the caller parses and writes, and
+    bursts are absorbed instead of blocking adb. The pipe is read as
+    bytes, as much as is available at a time (up to READ_CHUNK_SIZE).
+    Each chunk's complete lines are decoded as UTF-8 with replacement in
+    one call and queued together, so a stray invalid byte from the device
+    cannot end the stream, and the per-line cost is just the split.
+
+    Args:
+        stream: The binary stream to read (adb's stdout).
+        maxsize: Maximum number of chunks buffered in the queue.
+        on_idle: Called whenever no input is waiting, before blocking for
+            more (used to flush batched output).
+
+    Yields:
+        Lines in the order they were read, without their "\n", until the
+        stream ends.
+    """
+    chunks: queue.Queue[list[str] | None] = queue.Queue(maxsize=maxsize)
+    read = getattr(stream, "read1", stream.read)
+
+    def pump() -> None:
+        partial = b""
+        try:
+            while data := read(READ_CHUNK_SIZE):
+                # "\n" never occurs inside a multi-byte UTF-8 sequence, so
+                # everything up to the last one decodes on its own
+                end = data.rfind(b"\n")
+                if end == -1:
+                    partial += data
+                    continue
+                complete = partial + data[:end] if partial else data[:end]
+                partial = data[end + 1:]
+                chunks.put(complete.decode("utf-8", "replace").split("\n"))
+            if partial:
+                chunks.put([partial.decode("utf-8", "replace")])
+        finally:
+            chunks.put(None)  # End of stream
+
+    threading.Thread(target=pump, name="lcfilter-reader", daemon=True).start()
+
+    while True:
+        if on_idle is not None and chunks.empty():
+            on_idle()
+        lines = chunks.get()
+        if lines is None:
+            return
+        yield from lines
+
+
+def _route_lines(
+    lines: Iterator[str], engine: FilterEngine, router: StreamRouter, color: bool
+) -> None:
+    """Parse, route and write each line; the monitor hot loop.
+
+    Which categories go to stdout is worked out once up front, and
+    routing goes through the engine's batch API, so each line costs one
+    parse, one routing decision and one write.
+    """
+    colored_categories = (
+        {c for c in RouteCategory if _is_stdout_stream(c, router.config)}
+        if color
+        else set()
+    )
+    writers = [router.entry_writer(category) for category in RouteCategory]
+    print_entry = _print_entry
+
+    for result in engine.route_entries(map(parse_logcat_line, lines)):
+        category = result.category
+        entry = result.entry
+
+        if category in colored_categories:
+            # Use colored output for stdout streams
+            print_entry(entry, True)
+        else:
+            # Plain output for file streams
+            writers[category](entry.raw_line)
+
+
 def _is_stdout_stream(category: RouteCategory, config: RoutingConfig) -> bool:
     """Check if a category routes to stdout."""
     if category == RouteCategory.IN_SCOPE:
@@ -367,14 +577,6 @@ def _is_stdout_stream(category: RouteCategory, config: RoutingConfig) -> bool:
         return config.noise.is_stdout()
 
 
-def _print_entry_to_category(
-    entry, category: RouteCategory, config: RoutingConfig, color: bool = True
-) -> None:
-    """Print entry to stdout if that category goes to stdout."""
-    if _is_stdout_stream(category, config):
-        _print_entry(entry, color=color)
-
-
 # Register 'mon' as an alias for 'monitor'
 app.command("mon", hidden=True)(monitor)
 
@@ -411,32 +613,65 @@ def _load_scope_config(path: Path | None) -> ScopeConfig:
         raise typer.Exit(1)
 
 
-# Level to color mapping for rich output
-LEVEL_COLORS = {
-    LogLevel.VERBOSE: "dim",
-    LogLevel.DEBUG: "blue",
-    LogLevel.INFO: "green",
-    LogLevel.WARNING: "yellow",
-    LogLevel.ERROR: "red",
-    LogLevel.FATAL: "red bold",
-    LogLevel.SILENT: "dim",
+# ANSI SGR prefixes per level, written directly instead of going through Rich
+LEVEL_ANSI: dict[LogLevel, bytes] = {
+    LogLevel.VERBOSE: b"\x1b[2m",
+    LogLevel.DEBUG: b"\x1b[34m",
+    LogLevel.INFO: b"\x1b[32m",
+    LogLevel.WARNING: b"\x1b[33m",
+    LogLevel.ERROR: b"\x1b[31m",
+    LogLevel.FATAL: b"\x1b[1;31m",
+    LogLevel.SILENT: b"\x1b[2m",
 }
+ANSI_RESET = b"\x1b[0m"
+
+
+def _use_color(color: bool) -> bool:
+    """Whether colored output should be written to stdout.
+
+    Follows Rich's own detection, so colors are dropped when stdout is not
+    a terminal or NO_COLOR is set.
+    """
+    return color and console.color_system is not None and not console.no_color
+
+
+def _flush_stdout() -> None:
+    """Flush stdout, including lines written straight to its byte buffer."""
+    sys.stdout.flush()
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is not None:
+        buffer.flush()
 
 
 def _print_entry(entry, color: bool = True) -> None:
-    """Print a log entry with optional coloring."""
-    if not color:
-        console.print(entry.raw_line, highlight=False)
+    """Print a log entry with optional coloring.
+
+    Lines are written to stdout's byte buffer, colored lines with
+    precomputed escape sequences; Rich is too slow to call once per log
+    line. Callers flush with _flush_stdout() when the input goes quiet.
+    """
+    _print_line(entry.raw_line, entry.level, color)
+
+
+def _print_line(raw_line: str, level: LogLevel | None, color: bool) -> None:
+    """Write one raw line to stdout, colored by level if requested.
+
+    Falls back to writing text when stdout has no byte buffer (it has
+    been replaced by a StringIO or similar).
+    """
+    prefix = LEVEL_ANSI.get(level) if color and level else None
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        if prefix is not None:
+            raw_line = prefix.decode() + raw_line + ANSI_RESET.decode()
+        sys.stdout.write(raw_line + "\n")
         return
 
-    # Apply color based on log level
-    if entry.level and entry.level in LEVEL_COLORS:
-        style = LEVEL_COLORS[entry.level]
-        text = Text(entry.raw_line, style=style)
-        console.print(text, highlight=False)
+    line = raw_line.encode("utf-8", "replace")
+    if prefix is not None:
+        buffer.write(prefix + line + ANSI_RESET + b"\n")
     else:
-        console.print(entry.raw_line, highlight=False)
-
+        buffer.write(line + b"\n")
 
 if __name__ == "__main__":
     app()
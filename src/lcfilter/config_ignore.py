@@ -1,8 +1,10 @@
 """Parser for .logcatignore configuration files."""
 
 from pathlib import Path
+from typing import Callable, Iterable, Pattern
 import re
 
+from .config_reader import iter_config_lines
 from .models import (
     IgnoreConfig,
     IgnoreRule,
@@ -13,6 +15,7 @@ from .models import (
     IgnoreRuleLinePattern,
     LogLevel,
 )
+from .regex_backend import compile_pattern
 
 
 class IgnoreParseError(Exception):
@@ -37,8 +40,7 @@ def parse_ignore_file(path: Path) -> IgnoreConfig:
         FileNotFoundError: If the file doesn't exist.
         IgnoreParseError: If the file contains invalid syntax.
     """
-    content = path.read_text(encoding="utf-8")
-    return parse_ignore_content(content)
+    return _parse_ignore_lines(iter_config_lines(path))
 
 
 def parse_ignore_content(content: str) -> IgnoreConfig:
@@ -53,13 +55,21 @@ def parse_ignore_content(content: str) -> IgnoreConfig:
     Raises:
         IgnoreParseError: If the content contains invalid syntax.
     """
-    config = IgnoreConfig()
+    return _parse_ignore_lines(content.splitlines())
 
-    for line_number, line in enumerate(content.splitlines(), start=1):
+
+def _parse_ignore_lines(lines: Iterable[str]) -> IgnoreConfig:
+    """Parse .logcatignore lines from any iterable (list or open file)."""
+    rules: list[IgnoreRule] = []
+
+    for line_number, line in enumerate(lines, start=1):
         rule = parse_ignore_line(line, line_number)
         if rule is not None:
-            config.add_rule(rule)
+            rules.append(rule)
 
+    config = IgnoreConfig(rules=rules)
+    # Fuse pattern rules once, now that every regex has been validated
+    config.finalize()
     return config
 
 
@@ -80,20 +90,24 @@ def parse_ignore_line(line: str, line_number: int) -> IgnoreRule | None:
     line = line.strip()
 
     # Skip empty lines and comments
-    if not line or line.startswith("#"):
+    if not line or line[0] == "#":
         return None
 
-    # Parse rule type and value
-    if ":" not in line:
+    # Split only on first colon for PREFIX:value format
+    rule_type, colon, value = line.partition(":")
+    if not colon:
         raise IgnoreParseError(
             "Invalid rule format. Expected TYPE:value",
             line_number,
             line,
         )
 
-    # Split only on first colon for PREFIX:value format
-    rule_type, _, value = line.partition(":")
-    rule_type = rule_type.strip().upper()
+    # Prefixes are usually written exactly as the table keys; only
+    # normalize spacing and case when the direct lookup misses
+    handler = _RULE_HANDLERS.get(rule_type)
+    if handler is None:
+        rule_type = rule_type.strip().upper()
+        handler = _RULE_HANDLERS.get(rule_type)
     value = value.strip()
 
     if not value:
@@ -103,24 +117,14 @@ def parse_ignore_line(line: str, line_number: int) -> IgnoreRule | None:
             line,
         )
 
-    match rule_type:
-        case "TAG":
-            return _parse_tag_rule(value, line_number, line)
-        case "LEVEL":
-            return _parse_level_rule(value, line_number, line)
-        case "TAGLEVEL":
-            return _parse_taglevel_rule(value, line_number, line)
-        case "PATTERN":
-            return _parse_pattern_rule(value, line_number, line)
-        case "LINEPATTERN":
-            return _parse_linepattern_rule(value, line_number, line)
-        case _:
-            raise IgnoreParseError(
-                f"Unknown rule type: {rule_type}. "
-                "Expected TAG, LEVEL, TAGLEVEL, PATTERN, or LINEPATTERN",
-                line_number,
-                line,
-            )
+    if handler is None:
+        raise IgnoreParseError(
+            f"Unknown rule type: {rule_type}. "
+            "Expected TAG, LEVEL, TAGLEVEL, PATTERN, or LINEPATTERN",
+            line_number,
+            line,
+        )
+    return handler(value, line_number, line)
 
 
 def _parse_tag_rule(value: str, line_number: int, line: str) -> IgnoreRuleTag:
@@ -165,24 +169,34 @@ def _parse_taglevel_rule(value: str, line_number: int, line: str) -> IgnoreRuleT
 
 def _parse_pattern_rule(value: str, line_number: int, line: str) -> IgnoreRulePattern:
     """Parse a PATTERN:regex rule."""
-    try:
-        # Validate the regex by compiling it
-        re.compile(value)
-    except re.error as e:
-        raise IgnoreParseError(f"Invalid regex pattern: {e}", line_number, line) from e
-
-    return IgnoreRulePattern(pattern_str=value)
+    return IgnoreRulePattern(
+        pattern_str=value, compiled=_compile_rule_regex(value, line_number, line)
+    )
 
 
 def _parse_linepattern_rule(value: str, line_number: int, line: str) -> IgnoreRuleLinePattern:
     """Parse a LINEPATTERN:regex rule."""
+    return IgnoreRuleLinePattern(
+        pattern_str=value, compiled=_compile_rule_regex(value, line_number, line)
+    )
+
+
+def _compile_rule_regex(value: str, line_number: int, line: str) -> Pattern[str]:
+    """Validate a rule's regex by compiling it, and keep the result."""
     try:
-        # Validate the regex by compiling it
-        re.compile(value)
+        return compile_pattern(value)
     except re.error as e:
         raise IgnoreParseError(f"Invalid regex pattern: {e}", line_number, line) from e
 
-    return IgnoreRuleLinePattern(pattern_str=value)
+
+# Rule parsers by (upper-cased) rule type prefix
+_RULE_HANDLERS: dict[str, Callable[[str, int, str], IgnoreRule]] = {
+    "TAG": _parse_tag_rule,
+    "LEVEL": _parse_level_rule,
+    "TAGLEVEL": _parse_taglevel_rule,
+    "PATTERN": _parse_pattern_rule,
+    "LINEPATTERN": _parse_linepattern_rule,
+}
 
 
 # --- Sample file generation ---
@@ -195,7 +209,7 @@ SAMPLE_LOGCATIGNORE = """\
 #   LEVEL:V               - Ignore all lines with this level (V/D/I/W/E)
 #   TAGLEVEL:TagName:V    - Ignore lines with this tag AND level
 #   PATTERN:regex         - Ignore lines where message matches regex
-#   LINEPATTERN:regex     - Ignore lines where full line matches regex
+#   LINEPATTERN:regex     - Ignore lines where the full raw line matches regex
 
 # Ignore verbose and debug logs by default
 LEVEL:V
@@ -0,0 +1,54 @@
+"""Line reader for .logcatignore/.logcatscope files."""
+
+import mmap
+import os
+from pathlib import Path
+from typing import Iterator
+
+
+def iter_config_lines(path: Path) -> Iterator[str]:
+    """Yield the lines of a config file, decoded as UTF-8.
+
+    Regular files are memory-mapped read-only. On Linux the mapping is
+    created with MAP_POPULATE so the kernel faults the whole file in up
+    front instead of one page at a time while parsing. Files that cannot
+    be mapped (empty files, pipes, special devices) are read normally.
+    Either way the contents are decoded and split in one pass, so line
+    boundaries are those of str.splitlines(), as for config content
+    parsed from a string.
+
+    Args:
+        path: Path to the config file.
+
+    Yields:
+        Each line, including its line terminator.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+        UnicodeDecodeError: If the file is not valid UTF-8.
+    """
+    with open(path, "rb") as f:
+        mapped = _map_file(f.fileno())
+        if mapped is None:
+            text = f.read().decode("utf-8")
+        else:
+            with mapped:
+                text = str(mapped, "utf-8")
+
+    yield from text.splitlines(keepends=True)
+
+
+def _map_file(fd: int) -> mmap.mmap | None:
+    """Map a file read-only, or return None if it cannot be mapped."""
+    try:
+        if os.fstat(fd).st_size == 0:
+            return None
+
+        if hasattr(mmap, "MAP_PRIVATE"):
+            # POSIX: private read-only mapping, prefaulted where supported
+            flags = mmap.MAP_PRIVATE | getattr(mmap, "MAP_POPULATE", 0)
+            return mmap.mmap(fd, 0, flags=flags, prot=mmap.PROT_READ)
+
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
@@ -1,7 +1,9 @@
 """Parser for .logcatscope configuration files (simple line-based format)."""
 
 from pathlib import Path
+from typing import Iterable, Iterator
 
+from .config_reader import iter_config_lines
 from .models import ScopeConfig
 
 
@@ -29,8 +31,7 @@ def parse_scope_file(path: Path) -> ScopeConfig:
         FileNotFoundError: If the file doesn't exist.
         ScopeParseError: If the file contains invalid content.
     """
-    content = path.read_text(encoding="utf-8")
-    return parse_scope_content(content)
+    return _parse_scope_lines(iter_config_lines(path))
 
 
 def parse_scope_content(content: str) -> ScopeConfig:
@@ -51,31 +52,33 @@ def parse_scope_content(content: str) -> ScopeConfig:
     Raises:
         ScopeParseError: If the content is invalid.
     """
-    tags: set[str] = set()
+    return _parse_scope_lines(content.splitlines())
 
-    for line_number, line in enumerate(content.splitlines(), start=1):
+
+def _parse_scope_lines(lines: Iterable[str]) -> ScopeConfig:
+    """Parse .logcatscope lines from any iterable (list or open file)."""
+    return ScopeConfig(tags=frozenset(_iter_scope_tags(lines)))
+
+
+def _iter_scope_tags(lines: Iterable[str]) -> Iterator[str]:
+    """Yield the tag on each non-blank, non-comment line."""
+    for line_number, line in enumerate(lines, start=1):
         # Strip whitespace
         line = line.strip()
 
-        # Skip empty lines
-        if not line:
+        # Skip empty lines and comments
+        if not line or line[0] == "#":
             continue
 
-        # Skip comments
-        if line.startswith("#"):
-            continue
-
-        # Validate tag (no spaces allowed in tag names)
+        # Validate tag (no spaces allowed in tag names). Two substring
+        # tests are cheaper than a regex search or split() per line.
         if " " in line or "\t" in line:
             raise ScopeParseError(
                 f"Invalid tag '{line}' - tags cannot contain whitespace",
                 line_number=line_number,
             )
 
-        # Add the tag
-        tags.add(line)
-
-    return ScopeConfig(tags=tags)
+        yield line
 
 
 # --- Sample file generation ---
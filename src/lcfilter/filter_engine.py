@@ -1,13 +1,11 @@
 """Filter engine for applying ignore rules to log entries."""
 
-from typing import Iterator, Callable
+from typing import Callable, Iterable, Iterator
 
 from .models import (
     LogEntry,
     IgnoreConfig,
     IgnoreRule,
-    IgnoreRulePattern,
-    IgnoreRuleLinePattern,
     ScopeConfig,
     FilterResult,
     RouteCategory,
@@ -31,11 +29,9 @@ def is_event_in_scope(entry: LogEntry, scope: ScopeConfig | None) -> bool:
     if scope is None:
         return False
 
-    tag = entry.tag or ""
-    if not tag:
-        return False
-
-    return tag in scope.tags
+    # Tags are interned, so the set lookup is effectively a pointer compare
+    tag = entry.tag
+    return bool(tag) and tag in scope.tags
 
 
 def is_pattern_based_rule(rule: IgnoreRule) -> bool:
@@ -50,7 +46,7 @@ def is_pattern_based_rule(rule: IgnoreRule) -> bool:
     Returns:
         True if the rule is pattern-based.
     """
-    return isinstance(rule, (IgnoreRulePattern, IgnoreRuleLinePattern))
+    return rule.IS_PATTERN_BASED
 
 
 class FilterEngine:
@@ -87,6 +83,9 @@ class FilterEngine:
         self._pre_filters: list[Callable[[LogEntry], FilterResult | None]] = []
         self._post_filters: list[Callable[[FilterResult], FilterResult]] = []
 
+        # filter_entry() composed with the hooks, rebuilt when one is added
+        self._pipeline: Callable[[LogEntry], FilterResult] = self._apply_rules
+
     def add_pre_filter(
         self, hook: Callable[[LogEntry], FilterResult | None]
     ) -> None:
@@ -100,6 +99,7 @@ class FilterEngine:
             hook: Function that takes LogEntry and optionally returns FilterResult.
         """
         self._pre_filters.append(hook)
+        self._pipeline = self._compose_pipeline()
 
     def add_post_filter(
         self, hook: Callable[[FilterResult], FilterResult]
@@ -113,6 +113,21 @@ class FilterEngine:
             hook: Function that takes and returns FilterResult.
         """
         self._post_filters.append(hook)
+        self._pipeline = self._compose_pipeline()
+
+    def _compose_pipeline(self) -> Callable[[LogEntry], FilterResult]:
+        """Compose the hooks and rule check into a single callable.
+
+        Pre-filters are chained in the order they were added, falling
+        through to the ignore rules, and post-filters wrap the result of
+        the whole chain, so filter_entry() runs no per-entry hook loops.
+        """
+        pipeline = self._apply_rules
+        for pre_filter in reversed(self._pre_filters):
+            pipeline = _with_pre_filter(pre_filter, pipeline)
+        for post_filter in self._post_filters:
+            pipeline = _with_post_filter(post_filter, pipeline)
+        return pipeline
 
     def filter_entry(self, entry: LogEntry) -> FilterResult:
         """Filter a single log entry.
@@ -123,23 +138,17 @@ class FilterEngine:
         Returns:
             FilterResult indicating whether to display and metadata.
         """
-        # Run pre-filters
-        for pre_filter in self._pre_filters:
-            result = pre_filter(entry)
-            if result is not None:
-                return self._apply_post_filters(result)
+        return self._pipeline(entry)
 
-        # Check ignore rules
+    def _apply_rules(self, entry: LogEntry) -> FilterResult:
+        """Filter an entry on the ignore rules alone, without hooks."""
         matched_rule = self._check_ignore_rules(entry)
-
-        result = FilterResult(
+        return FilterResult(
             entry=entry,
             should_display=matched_rule is None,
             matched_rule=matched_rule,
         )
 
-        return self._apply_post_filters(result)
-
     def route_entry(self, entry: LogEntry) -> RouteResult:
         """Route a log entry to one of three categories.
 
@@ -157,23 +166,74 @@ class FilterEngine:
         Returns:
             RouteResult with category and optional matched rule.
         """
-        # First check: Is this in-scope?
-        if is_event_in_scope(entry, self.scope_config):
+        # First check: Is this in-scope? (is_event_in_scope, inlined: the
+        # engine always has a scope config)
+        tag = entry.tag
+        if tag and tag in self.scope_config.tags:
             return RouteResult(entry=entry, category=RouteCategory.IN_SCOPE)
 
+        # Without rules (the common clean config) nothing else can match
+        if not self.ignore_config.rules:
+            return RouteResult(entry=entry, category=RouteCategory.NOISE)
+
         # Second check: Does it match any ignore rule?
         # For out-of-scope, check ALL rules (not just pattern-based)
-        for rule in self.ignore_config.rules:
-            if rule.matches(entry):
-                return RouteResult(
-                    entry=entry,
-                    category=RouteCategory.IGNORED,
-                    matched_rule=rule,
-                )
+        config = self.ignore_config
+        config.finalize()
+        rule = config.rule_matcher(entry, False)
+        if rule is not None:
+            return RouteResult(
+                entry=entry,
+                category=RouteCategory.IGNORED,
+                matched_rule=rule,
+            )
 
         # Default: noise
         return RouteResult(entry=entry, category=RouteCategory.NOISE)
 
+    def route_entries(self, entries: Iterable[LogEntry]) -> Iterator[RouteResult]:
+        """Route many log entries, same as calling route_entry() on each.
+
+        Per-entry setup (finalizing the config, looking up the scope tags
+        and rule matcher) is done once for the whole batch, so rules added
+        to the config while iterating are not seen.
+
+        Args:
+            entries: The log entries to route.
+
+        Yields:
+            RouteResult for each entry, in order.
+        """
+        config = self.ignore_config
+        config.finalize()
+        first_matching_rule = config.rule_matcher
+        scope_tags = self.scope_config.tags
+        in_scope, ignored, noise = (
+            RouteCategory.IN_SCOPE,
+            RouteCategory.IGNORED,
+            RouteCategory.NOISE,
+        )
+
+        if not config.rules:
+            # Without rules there is nothing to look up per entry
+            for entry in entries:
+                tag = entry.tag
+                yield RouteResult(entry, in_scope if tag and tag in scope_tags else noise)
+            return
+
+        # Results are built positionally: (entry, category, matched_rule)
+        for entry in entries:
+            tag = entry.tag
+            if tag and tag in scope_tags:
+                yield RouteResult(entry, in_scope)
+                continue
+
+            rule = first_matching_rule(entry, False)
+            if rule is not None:
+                yield RouteResult(entry, ignored, rule)
+            else:
+                yield RouteResult(entry, noise)
+
     def _check_ignore_rules(self, entry: LogEntry) -> IgnoreRule | None:
         """Check if any ignore rule matches the entry.
 
@@ -189,27 +249,22 @@ class FilterEngine:
         Returns:
             The first matching rule, or None if no rules match.
         """
-        in_scope = is_event_in_scope(entry, self.scope_config)
-
-        for rule in self.ignore_config.rules:
-            # For in-scope events, skip non-pattern rules
-            if in_scope and not is_pattern_based_rule(rule):
-                continue
-
-            if rule.matches(entry):
-                return rule
-        return None
-
-    def _apply_post_filters(self, result: FilterResult) -> FilterResult:
-        """Apply post-filter hooks to the result."""
-        for post_filter in self._post_filters:
-            result = post_filter(result)
-        return result
+        tag = entry.tag
+        in_scope = bool(tag) and tag in self.scope_config.tags
+        # The config's rule matcher is specialized for the loaded rules
+        # when it is finalized, and returns the first match in file order
+        config = self.ignore_config
+        config.finalize()
+        return config.rule_matcher(entry, in_scope)
 
     def filter_entries(
         self, entries: Iterator[LogEntry]
     ) -> Iterator[FilterResult]:
-        """Filter multiple log entries.
+        """Filter multiple log entries, same as calling filter_entry() on each.
+
+        Without hooks, per-entry setup (finalizing the config, looking up
+        the scope tags and rule matcher) is done once for the whole batch,
+        so rules added to the config while iterating are not seen.
 
         Args:
             entries: Iterator of log entries.
@@ -217,8 +272,30 @@ class FilterEngine:
         Yields:
             FilterResult for each entry.
         """
+        if self._pre_filters or self._post_filters:
+            yield from map(self.filter_entry, entries)
+            return
+
+        config = self.ignore_config
+        config.finalize()
+        if not config.rules:
+            # Without rules every entry is displayed
+            for entry in entries:
+                yield FilterResult(entry, True, None)
+            return
+
+        first_matching_rule = config.rule_matcher
+        scope_tags = self.scope_config.tags
+        has_pattern_rules = bool(config.pattern_rules or config.linepattern_rules)
+
         for entry in entries:
-            yield self.filter_entry(entry)
+            tag = entry.tag
+            if tag and tag in scope_tags:
+                # In-scope entries are only subject to pattern-based rules
+                rule = first_matching_rule(entry, True) if has_pattern_rules else None
+            else:
+                rule = first_matching_rule(entry, False)
+            yield FilterResult(entry, rule is None, rule)
 
     def filter_and_yield_visible(
         self, entries: Iterator[LogEntry]
@@ -226,6 +303,8 @@ class FilterEngine:
         """Filter entries and yield only those that should be displayed.
 
         This is a convenience method for simple filtering use cases.
+        Without hooks it decides visibility directly, like filter_entries()
+        but without building a FilterResult per entry.
 
         Args:
             entries: Iterator of log entries.
@@ -233,9 +312,54 @@ class FilterEngine:
         Yields:
             LogEntry objects that should be displayed.
         """
-        for result in self.filter_entries(entries):
-            if result.should_display:
-                yield result.entry
+        if self._pre_filters or self._post_filters:
+            for result in map(self.filter_entry, entries):
+                if result.should_display:
+                    yield result.entry
+            return
+
+        config = self.ignore_config
+        config.finalize()
+        if not config.rules:
+            yield from entries
+            return
+
+        first_matching_rule = config.rule_matcher
+        scope_tags = self.scope_config.tags
+        has_pattern_rules = bool(config.pattern_rules or config.linepattern_rules)
+
+        for entry in entries:
+            tag = entry.tag
+            if tag and tag in scope_tags:
+                if not has_pattern_rules or first_matching_rule(entry, True) is None:
+                    yield entry
+            elif first_matching_rule(entry, False) is None:
+                yield entry
+
+
+def _with_pre_filter(
+    pre_filter: Callable[[LogEntry], FilterResult | None],
+    rest: Callable[[LogEntry], FilterResult],
+) -> Callable[[LogEntry], FilterResult]:
+    """Run a pre-filter, falling through to the rest of the pipeline on None."""
+
+    def apply(entry: LogEntry) -> FilterResult:
+        result = pre_filter(entry)
+        return rest(entry) if result is None else result
+
+    return apply
+
+
+def _with_post_filter(
+    post_filter: Callable[[FilterResult], FilterResult],
+    rest: Callable[[LogEntry], FilterResult],
+) -> Callable[[LogEntry], FilterResult]:
+    """Pass the result of the rest of the pipeline through a post-filter."""
+
+    def apply(entry: LogEntry) -> FilterResult:
+        return post_filter(rest(entry))
+
+    return apply
 
 
 def create_default_engine(
@@ -264,13 +388,21 @@ class FilterStats:
     """Statistics tracker for filter operations.
 
     Useful for reporting filter effectiveness and debugging rules.
+
+    Matches are counted per rule object and only folded into the string
+    keys of rule_match_counts when it is read, so recording a match is a
+    dict lookup and an increment. The folded dict is kept, so reading it
+    again is free and changes made to it by callers are not lost.
     """
 
     def __init__(self) -> None:
         self.total_entries: int = 0
         self.displayed_entries: int = 0
         self.ignored_entries: int = 0
-        self.rule_match_counts: dict[str, int] = {}
+        self._rule_match_counts: dict[str, int] = {}
+        # Matches not yet folded into _rule_match_counts:
+        # id(rule) -> [rule, count]; the rule is kept so its id stays valid
+        self._rule_hits: dict[int, list] = {}
 
     def record(self, result: FilterResult) -> None:
         """Record a filter result in the stats."""
@@ -278,14 +410,53 @@ class FilterStats:
 
         if result.should_display:
             self.displayed_entries += 1
-        else:
-            self.ignored_entries += 1
+            return
+
+        self.ignored_entries += 1
+        rule = result.matched_rule
+        if rule is not None:
+            rule_hits = self._rule_hits
+            rule_id = id(rule)
+            hit = rule_hits.get(rule_id)
+            if hit is None:
+                rule_hits[rule_id] = [rule, 1]
+            else:
+                hit[1] += 1
 
-            if result.matched_rule is not None:
-                rule_key = self._rule_key(result.matched_rule)
-                self.rule_match_counts[rule_key] = (
-                    self.rule_match_counts.get(rule_key, 0) + 1
-                )
+    @property
+    def rule_match_counts(self) -> dict[str, int]:
+        """Number of matches per rule, keyed by a readable rule key."""
+        if self._rule_hits:
+            self._fold_rule_hits()
+        return self._rule_match_counts
+
+    @rule_match_counts.setter
+    def rule_match_counts(self, counts: dict[str, int]) -> None:
+        self._rule_hits.clear()
+        self._rule_match_counts = counts
+
+    def merge(self, other: "FilterStats") -> None:
+        """Add the counts from another stats tracker into this one."""
+        self.total_entries += other.total_entries
+        self.displayed_entries += other.displayed_entries
+        self.ignored_entries += other.ignored_entries
+        counts = self.rule_match_counts
+        for rule_key, count in other.rule_match_counts.items():
+            counts[rule_key] = counts.get(rule_key, 0) + count
+
+    def __getstate__(self) -> dict:
+        # Pickle counts by key, not the rules (compiled patterns may not
+        # pickle, and ids mean nothing in another process)
+        self._fold_rule_hits()
+        return self.__dict__.copy()
+
+    def _fold_rule_hits(self) -> None:
+        """Move the per-rule-object counts into _rule_match_counts."""
+        counts = self._rule_match_counts
+        for rule, count in self._rule_hits.values():
+            rule_key = self._rule_key(rule)
+            counts[rule_key] = counts.get(rule_key, 0) + count
+        self._rule_hits.clear()
 
     @staticmethod
     def _rule_key(rule: IgnoreRule) -> str:
@@ -307,10 +478,11 @@ class FilterStats:
             f"Ignored: {self.ignored_entries} ({self.filter_rate:.1f}%)",
         ]
 
-        if self.rule_match_counts:
+        rule_match_counts = self.rule_match_counts
+        if rule_match_counts:
             lines.append("\nRule match counts:")
             for rule_key, count in sorted(
-                self.rule_match_counts.items(),
+                rule_match_counts.items(),
                 key=lambda x: x[1],
                 reverse=True,
             ):
@@ -1,9 +1,20 @@
 """Data models for lcfilter."""
 
 from dataclasses import dataclass, field
-from enum import Enum, auto
-from typing import Pattern
+from enum import Enum, IntEnum
+from typing import Callable, ClassVar, Pattern
 import re
+import sys
+
+from .regex_backend import (
+    anchored_prefix,
+    build_literal_screen,
+    build_pattern_set,
+    compile_pattern,
+    compile_search_form,
+    required_literal,
+    search_equivalent,
+)
 
 
 class LogLevel(Enum):
@@ -16,22 +27,36 @@ class LogLevel(Enum):
     FATAL = "F"
     SILENT = "S"
 
+    # Members are singletons compared by identity, so the identity hash is
+    # consistent with equality; it is computed in C, unlike Enum.__hash__,
+    # which matters for the per-line level lookups in rule indexes.
+    __hash__ = object.__hash__
+
     @classmethod
     def from_str(cls, value: str) -> "LogLevel":
         """Parse a log level from a string."""
-        value = value.upper().strip()
-        for level in cls:
-            if level.value == value:
-                return level
-        raise ValueError(f"Unknown log level: {value}")
+        level = LEVELS_BY_CHAR.get(value)
+        if level is None:
+            value = value.upper().strip()
+            level = LEVELS_BY_CHAR.get(value)
+            if level is None:
+                raise ValueError(f"Unknown log level: {value}")
+        return level
+
 
+# Log levels by their logcat letter, for direct lookup when parsing
+LEVELS_BY_CHAR: dict[str, LogLevel] = {level.value: level for level in LogLevel}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class LogEntry:
     """A parsed logcat log entry.
 
+    Entries are immutable (the parser hands out cached instances for
+    repeated lines) and slotted, as one is created per log line.
+
     Attributes:
-        raw_line: The original unparsed line.
+        raw_line: The original unparsed line, without its line terminator.
         timestamp: The timestamp string (if present).
         pid: Process ID (if present).
         tid: Thread ID (if present).
@@ -48,6 +73,43 @@ class LogEntry:
     message: str = ""
 
 
+def _log_entry_init():
+    """Build a LogEntry.__init__ that stores through the slot descriptors.
+
+    The __init__ dataclasses generates for a frozen class assigns each
+    field with object.__setattr__, which looks the attribute up by name;
+    setting the slots directly is the same assignment at about half the
+    cost, and one entry is built per parsed line.
+    """
+    set_raw_line, set_timestamp, set_pid, set_tid, set_level, set_tag, set_message = (
+        getattr(LogEntry, name).__set__ for name in LogEntry.__slots__
+    )
+
+    def __init__(
+        self,
+        raw_line: str,
+        timestamp: str | None = None,
+        pid: int | None = None,
+        tid: int | None = None,
+        level: LogLevel | None = None,
+        tag: str | None = None,
+        message: str = "",
+    ) -> None:
+        set_raw_line(self, raw_line)
+        set_timestamp(self, timestamp)
+        set_pid(self, pid)
+        set_tid(self, tid)
+        set_level(self, level)
+        set_tag(self, tag)
+        set_message(self, message)
+
+    __init__.__qualname__ = "LogEntry.__init__"
+    return __init__
+
+
+LogEntry.__init__ = _log_entry_init()
+
+
 # --- Ignore Rule Types ---
 
 class IgnoreRuleType(Enum):
@@ -59,19 +121,30 @@ class IgnoreRuleType(Enum):
     LINEPATTERN = "LINEPATTERN"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IgnoreRuleTag:
-    """Ignore rule: match by tag name."""
+    """Ignore rule: match by tag name.
+
+    The tag is interned, like the tags the parser produces, so comparing
+    them (and looking them up in rule indexes) is a pointer compare.
+    """
+    IS_PATTERN_BASED: ClassVar[bool] = False
+
     tag: str
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "tag", sys.intern(self.tag))
+
     def matches(self, entry: LogEntry) -> bool:
         """Check if this rule matches the log entry."""
         return entry.tag == self.tag
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IgnoreRuleLevel:
     """Ignore rule: match by log level."""
+    IS_PATTERN_BASED: ClassVar[bool] = False
+
     level: LogLevel
 
     def matches(self, entry: LogEntry) -> bool:
@@ -79,43 +152,118 @@ class IgnoreRuleLevel:
         return entry.level == self.level
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IgnoreRuleTagLevel:
-    """Ignore rule: match by tag AND level combination."""
+    """Ignore rule: match by tag AND level combination (tag interned)."""
+    IS_PATTERN_BASED: ClassVar[bool] = False
+
     tag: str
     level: LogLevel
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "tag", sys.intern(self.tag))
+
     def matches(self, entry: LogEntry) -> bool:
         """Check if this rule matches the log entry."""
         return entry.tag == self.tag and entry.level == self.level
 
 
-@dataclass
+@dataclass(slots=True)
 class IgnoreRulePattern:
-    """Ignore rule: match by regex pattern on the message."""
+    """Ignore rule: match by regex pattern on the message.
+
+    Attributes:
+        pattern_str: The source regex.
+        compiled: The compiled regex. Compiled from pattern_str when not
+            supplied, so callers that already validated the pattern can
+            hand it over instead of compiling it twice.
+        literal_hint: A literal every match must contain, if one exists.
+            Checked with a plain substring search before the regex runs.
+        anchored_prefix: Literal text every match starts the string with
+            (as with `^E/...`), if any. Checked with startswith() first.
+        is_literal: The pattern is plain text (its literal hint is the
+            whole pattern), so a substring search decides the match and
+            the regex is never run.
+        search_source: The pattern's search-equivalent form (see
+            regex_backend.search_equivalent), kept for fusing rules.
+    """
+    IS_PATTERN_BASED: ClassVar[bool] = True
+
     pattern_str: str
-    _compiled: Pattern[str] = field(init=False, repr=False, compare=False)
+    compiled: Pattern[str] | None = field(default=None, repr=False, compare=False)
+    literal_hint: str | None = field(default=None, init=False, repr=False, compare=False)
+    anchored_prefix: str | None = field(default=None, init=False, repr=False, compare=False)
+    is_literal: bool = field(default=False, init=False, repr=False, compare=False)
+    search_source: str = field(default="", init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        self._compiled = re.compile(self.pattern_str)
+        if self.compiled is None:
+            self.compiled = compile_pattern(self.pattern_str)
+        self.search_source = search_equivalent(self.pattern_str)
+        self.literal_hint = required_literal(self.pattern_str)
+        self.anchored_prefix = anchored_prefix(self.pattern_str)
+        self.is_literal = self.literal_hint == self.pattern_str
+
+    def __reduce__(self):
+        # Recompile from source when unpickled; re2 patterns do not pickle
+        return (type(self), (self.pattern_str,))
 
     def matches(self, entry: LogEntry) -> bool:
         """Check if this rule matches the log entry."""
-        return bool(self._compiled.search(entry.message))
+        text = entry.message
+        if self.is_literal:
+            return self.literal_hint in text
+        if self.anchored_prefix is not None and not text.startswith(self.anchored_prefix):
+            return False
+        if self.literal_hint is not None and self.literal_hint not in text:
+            return False
+        return self.compiled.search(text) is not None
 
 
-@dataclass
+@dataclass(slots=True)
 class IgnoreRuleLinePattern:
-    """Ignore rule: match by regex pattern on the full raw line."""
+    """Ignore rule: match by regex pattern on the full raw line.
+
+    Attributes:
+        pattern_str: The source regex.
+        compiled: The compiled regex (see IgnoreRulePattern.compiled).
+        literal_hint: Required literal (see IgnoreRulePattern.literal_hint).
+        anchored_prefix: Required prefix (see IgnoreRulePattern.anchored_prefix),
+            typically a level such as "D/".
+        is_literal: Plain-text pattern (see IgnoreRulePattern.is_literal).
+        search_source: Search form (see IgnoreRulePattern.search_source).
+    """
+    IS_PATTERN_BASED: ClassVar[bool] = True
+
     pattern_str: str
-    _compiled: Pattern[str] = field(init=False, repr=False, compare=False)
+    compiled: Pattern[str] | None = field(default=None, repr=False, compare=False)
+    literal_hint: str | None = field(default=None, init=False, repr=False, compare=False)
+    anchored_prefix: str | None = field(default=None, init=False, repr=False, compare=False)
+    is_literal: bool = field(default=False, init=False, repr=False, compare=False)
+    search_source: str = field(default="", init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        self._compiled = re.compile(self.pattern_str)
+        if self.compiled is None:
+            self.compiled = compile_pattern(self.pattern_str)
+        self.search_source = search_equivalent(self.pattern_str)
+        self.literal_hint = required_literal(self.pattern_str)
+        self.anchored_prefix = anchored_prefix(self.pattern_str)
+        self.is_literal = self.literal_hint == self.pattern_str
+
+    def __reduce__(self):
+        # Recompile from source when unpickled; re2 patterns do not pickle
+        return (type(self), (self.pattern_str,))
 
     def matches(self, entry: LogEntry) -> bool:
         """Check if this rule matches the log entry."""
-        return bool(self._compiled.search(entry.raw_line))
+        text = entry.raw_line
+        if self.is_literal:
+            return self.literal_hint in text
+        if self.anchored_prefix is not None and not text.startswith(self.anchored_prefix):
+            return False
+        if self.literal_hint is not None and self.literal_hint not in text:
+            return False
+        return self.compiled.search(text) is not None
 
 
 # Union type for all ignore rules
@@ -128,26 +276,592 @@ IgnoreRule = (
 )
 
 
+# Name of the group wrapping the i-th pattern in a combined regex
+COMBINED_GROUP_PREFIX = "_r"
+
+# With fewer rules than this, plain-text rules are searched for one by one
+# rather than through the combined regex
+PREFIX_FUSION_MIN_RULES = 8
+
+# Rules fused per block when a kind has more rules than fit one combined
+# regex search efficiently (see _fused_blocks)
+PREFIX_BLOCK_SIZE = 32
+
+
+def combine_patterns(patterns: list[str], named: bool = True) -> Pattern[str] | None:
+    """Fuse several regexes into one alternation.
+
+    Each pattern is wrapped in a named group (_r0, _r1, ...) so that a
+    single search() answers "does any of them match?", and the match's
+    lastindex tells which branch matched (see combined_branch_table).
+
+    Capturing groups make every attempt at every position more expensive
+    for the stdlib engine, so with named=False the patterns are wrapped in
+    non-capturing groups instead. That alternation only answers whether
+    any pattern matches (and where); match() the named one at the same
+    position to find out which.
+
+    Args:
+        patterns: Source regexes, in rule order.
+        named: Wrap each pattern in a named group.
+
+    Returns:
+        The compiled alternation, or None if there is nothing to combine
+        or the patterns cannot be safely fused (group references would be
+        renumbered, group names collide, or inline global flags are not
+        at the start).
+    """
+    return _combine_search_forms(list(map(search_equivalent, patterns)), named)
+
+
+def _combine_search_forms(sources: list[str], named: bool = True) -> Pattern[str] | None:
+    """combine_patterns() for sources already in search-equivalent form.
+
+    Used with the rules' own search_source, so fusing rules (once per
+    kind, once per block) never parses a pattern again.
+    """
+    if not sources:
+        return None
+
+    for source in sources:
+        if _has_group_references(source):
+            return None
+
+    try:
+        return compile_search_form(
+            "|".join(
+                (f"(?P<{COMBINED_GROUP_PREFIX}{i}>" if named else "(?:") + source + ")"
+                for i, source in enumerate(sources)
+            )
+        )
+    except re.error:
+        return None
+
+
+def combined_branch_table(combined: Pattern[str], count: int) -> list[int]:
+    """Map a combined regex's group numbers to the index of their pattern.
+
+    The wrapping group is the outermost one of its branch and closes last,
+    so it is always a match's lastindex: table[match.lastindex] is the
+    pattern whose branch matched, without parsing the group's name. Note
+    that this is the branch matching at the leftmost position, not
+    necessarily the lowest-index pattern that matches somewhere in the
+    text. Numbers of groups inside the patterns map to -1.
+
+    Only the exact wrapper names for the count patterns combined are
+    looked up, so a user group that merely shares the prefix (such as
+    `(?P<_rx>...)`) is treated like any other inner group.
+    """
+    table = [-1] * (combined.groups + 1)
+    groupindex = combined.groupindex
+    for i in range(count):
+        table[groupindex[f"{COMBINED_GROUP_PREFIX}{i}"]] = i
+    return table
+
+
+def _has_group_references(pattern: str) -> bool:
+    """Conservatively check whether a regex refers back to its own groups."""
+    if "(?P=" in pattern or "(?(" in pattern:
+        return True
+    return re.search(r"\\[1-9]", pattern) is not None
+
+
+def _literal_screen(rules: list["PositionedRule"]) -> Callable[[str], bool] | None:
+    """Build a literal pre-screen for pattern rules, if all can be screened.
+
+    Each rule is screened on its literal hint, or failing that on its
+    anchored prefix; a rule with neither can match anything, so no screen
+    is built.
+    """
+    hints: list[str] = []
+    prefixes: list[str] = []
+    for _, rule in rules:
+        if rule.literal_hint is not None:
+            hints.append(rule.literal_hint)
+        elif rule.anchored_prefix is not None:
+            prefixes.append(rule.anchored_prefix)
+        else:
+            return None
+
+    if not prefixes:
+        return build_literal_screen(hints) if hints else None
+
+    starts = tuple(dict.fromkeys(prefixes))
+    if not hints:
+        return lambda text: text.startswith(starts)
+
+    hint_screen = build_literal_screen(hints)
+    return lambda text: text.startswith(starts) or hint_screen(text)
+
+
+def _derived(default_factory=lambda: None):
+    """Dataclass field for state derived from rules (not part of equality)."""
+    return field(
+        default_factory=default_factory, init=False, repr=False, compare=False
+    )
+
+
+# A rule together with its position in the rule list, so lookups in the
+# per-kind indexes can still honour first-match-wins ordering.
+PositionedRule = tuple[int, IgnoreRule]
+
+
 @dataclass
 class IgnoreConfig:
-    """Parsed .logcatignore configuration."""
+    """Parsed .logcatignore configuration.
+
+    Besides the ordered rules, the config carries derived structures
+    used to speed up matching, built by finalize(). The rule list may be
+    appended to or edited in place: finalize() keeps a copy of the rules
+    it built from and rebuilds whenever the list no longer equals it.
+
+    Attributes:
+        rules: Ignore rules in file order (first match wins).
+        tag_index: First TAG rule for each tag.
+        level_index: First LEVEL rule for each level.
+        taglevel_index: First TAGLEVEL rule for each tag, then level.
+        pattern_rules: PATTERN rules in order.
+        linepattern_rules: LINEPATTERN rules in order.
+        combined_pattern: All PATTERN rules fused into one regex. None
+            with more than PREFIX_BLOCK_SIZE of them, which are fused in
+            blocks instead (see _fused_blocks).
+        combined_linepattern: The same for LINEPATTERN rules.
+        pattern_gate: The PATTERN rules fused without capturing groups,
+            a faster first check than combined_pattern.
+        linepattern_gate: The same for LINEPATTERN rules.
+        pattern_screen: Cheap pre-check over the PATTERN rules' literal
+            hints; False means no PATTERN rule can match. None when some
+            rule has no hint.
+        linepattern_screen: The same for LINEPATTERN rules.
+        pattern_set: Multi-pattern matcher returning the index (into
+            pattern_rules) of the first matching PATTERN rule; None unless
+            the regex engine supports pattern sets.
+        linepattern_set: The same for LINEPATTERN rules.
+        rule_matcher: Function returning the first rule matching an entry,
+            specialized for the rules present (see _build_rule_matcher).
+    """
     rules: list[IgnoreRule] = field(default_factory=list)
+    tag_index: dict[str, PositionedRule] = _derived(dict)
+    level_index: dict[LogLevel, PositionedRule] = _derived(dict)
+    taglevel_index: dict[str, dict[LogLevel, PositionedRule]] = _derived(dict)
+    pattern_rules: list[PositionedRule] = _derived(list)
+    linepattern_rules: list[PositionedRule] = _derived(list)
+    combined_pattern: Pattern[str] | None = _derived()
+    combined_linepattern: Pattern[str] | None = _derived()
+    pattern_gate: Pattern[str] | None = _derived()
+    linepattern_gate: Pattern[str] | None = _derived()
+    pattern_screen: Callable[[str], bool] | None = _derived()
+    linepattern_screen: Callable[[str], bool] | None = _derived()
+    pattern_set: Callable[[str], int | None] | None = _derived()
+    linepattern_set: Callable[[str], int | None] | None = _derived()
+    rule_matcher: "RuleMatcher" = _derived(lambda: _no_rule_matches)
+    # Copy of the rules the derived structures were built from
+    _finalized_rules: list[IgnoreRule] | None = _derived()
 
     def add_rule(self, rule: IgnoreRule) -> None:
         """Add an ignore rule."""
         self.rules.append(rule)
 
+    def __reduce__(self):
+        # Only the rules are pickled; the derived structures hold closures
+        # and are rebuilt by finalize() on the receiving side
+        return (type(self), (list(self.rules),))
+
+    def finalize(self) -> None:
+        """Build the derived match structures for the current rules.
+
+        Cheap to call repeatedly; work is only done after rules changed.
+        """
+        # List equality checks the length, then each element by identity
+        # before falling back to ==, so an unchanged list costs one pass
+        # in C and no allocation; a rule swapped for an equal one matches
+        # the same entries and needs no rebuild
+        rules = self.rules
+        if rules == self._finalized_rules:
+            return
+
+        tag_index: dict[str, PositionedRule] = {}
+        level_index: dict[LogLevel, PositionedRule] = {}
+        taglevel_index: dict[str, dict[LogLevel, PositionedRule]] = {}
+        pattern_rules: list[PositionedRule] = []
+        linepattern_rules: list[PositionedRule] = []
+
+        for position, rule in enumerate(rules):
+            if isinstance(rule, IgnoreRuleTag):
+                tag_index.setdefault(rule.tag, (position, rule))
+            elif isinstance(rule, IgnoreRuleLevel):
+                level_index.setdefault(rule.level, (position, rule))
+            elif isinstance(rule, IgnoreRuleTagLevel):
+                taglevel_index.setdefault(rule.tag, {}).setdefault(
+                    rule.level, (position, rule)
+                )
+            elif isinstance(rule, IgnoreRulePattern):
+                pattern_rules.append((position, rule))
+            elif isinstance(rule, IgnoreRuleLinePattern):
+                linepattern_rules.append((position, rule))
+
+        self.tag_index = tag_index
+        self.level_index = level_index
+        self.taglevel_index = taglevel_index
+        self.pattern_rules = pattern_rules
+        self.linepattern_rules = linepattern_rules
+        patterns = [rule.pattern_str for _, rule in pattern_rules]
+        linepatterns = [rule.pattern_str for _, rule in linepattern_rules]
+        pattern_sources = [rule.search_source for _, rule in pattern_rules]
+        linepattern_sources = [rule.search_source for _, rule in linepattern_rules]
+        self.combined_pattern = (
+            _combine_search_forms(pattern_sources)
+            if len(pattern_sources) <= PREFIX_BLOCK_SIZE
+            else None
+        )
+        self.combined_linepattern = (
+            _combine_search_forms(linepattern_sources)
+            if len(linepattern_sources) <= PREFIX_BLOCK_SIZE
+            else None
+        )
+        # The gates are only useful alongside the named alternation
+        self.pattern_gate = (
+            _combine_search_forms(pattern_sources, named=False)
+            if self.combined_pattern is not None
+            else None
+        )
+        self.linepattern_gate = (
+            _combine_search_forms(linepattern_sources, named=False)
+            if self.combined_linepattern is not None
+            else None
+        )
+        self.pattern_screen = _literal_screen(pattern_rules)
+        self.linepattern_screen = _literal_screen(linepattern_rules)
+        self.pattern_set = build_pattern_set(patterns)
+        self.linepattern_set = build_pattern_set(linepatterns)
+        self.rule_matcher = _build_rule_matcher(self)
+        self._finalized_rules = list(rules)
+
+
+# Returns the first rule matching an entry; the flag restricts the search
+# to PATTERN and LINEPATTERN rules.
+RuleMatcher = Callable[[LogEntry, bool], IgnoreRule | None]
+
+
+def _no_rule_matches(entry: LogEntry, patterns_only: bool) -> None:
+    """Rule matcher for a config without rules."""
+    return None
+
+
+def _resolve_hashed_rules(
+    config: IgnoreConfig,
+) -> dict[str, dict[LogLevel | None, PositionedRule]]:
+    """Precompute the first TAG/LEVEL/TAGLEVEL rule for each tag and level.
+
+    For every tag named by a TAG or TAGLEVEL rule, maps each possible
+    level (including None, for unparsed levels) to the earliest of the
+    rules that would match that tag and level. Entries with other tags
+    can only match LEVEL rules, so level_index alone answers for them.
+    Either way one probe per entry decides all three rule kinds.
+    """
+    tags = set(config.tag_index) | set(config.taglevel_index)
+    resolved: dict[str, dict[LogLevel | None, PositionedRule]] = {}
+
+    for tag in tags:
+        tag_hit = config.tag_index.get(tag)
+        by_level = config.taglevel_index.get(tag, {})
+        table: dict[LogLevel | None, PositionedRule] = {}
+        for level in (*LogLevel, None):
+            hits = [
+                hit
+                for hit in (
+                    tag_hit,
+                    config.level_index.get(level),
+                    by_level.get(level),
+                )
+                if hit is not None
+            ]
+            if hits:
+                table[level] = min(hits, key=lambda hit: hit[0])
+        resolved[tag] = table
+
+    return resolved
+
+
+def _build_rule_matcher(config: IgnoreConfig) -> RuleMatcher:
+    """Build a first-match function specialized for a finalized config.
+
+    The config is fixed once loaded, so everything that does not depend on
+    the entry is decided here rather than per line: the indexes and
+    pattern tables are bound as closure variables, and rule kinds the
+    config does not use are left out of the generated function entirely.
+
+    TAG, LEVEL and TAGLEVEL rules are found with hash lookups. PATTERN and
+    LINEPATTERN rules are found by a scan specialized for each kind (see
+    _build_pattern_scan), bounded by the best hit so far, so the result is
+    the same as scanning the rule list in order.
+    """
+    if not config.rules:
+        return _no_rule_matches
+
+    no_match = len(config.rules)
+    level_index = config.level_index
+    by_tag = _resolve_hashed_rules(config)
+    has_hashed_rules = bool(by_tag or level_index)
+
+    scans = tuple(
+        _build_pattern_scan(rules, screen, pattern_set, combined, gate, by_line)
+        for rules, screen, pattern_set, combined, gate, by_line in (
+            (
+                config.pattern_rules,
+                config.pattern_screen,
+                config.pattern_set,
+                config.combined_pattern,
+                config.pattern_gate,
+                False,
+            ),
+            (
+                config.linepattern_rules,
+                config.linepattern_screen,
+                config.linepattern_set,
+                config.combined_linepattern,
+                config.linepattern_gate,
+                True,
+            ),
+        )
+        if rules
+    )
+
+    if not scans:
+        # Entries limited to pattern rules can never match
+        def first_hashed_rule(entry: LogEntry, patterns_only: bool) -> IgnoreRule | None:
+            if patterns_only:
+                return None
+            resolved = by_tag.get(entry.tag)
+            hit = (resolved if resolved is not None else level_index).get(entry.level)
+            return hit[1] if hit is not None else None
+
+        return first_hashed_rule
+
+    if not has_hashed_rules and len(scans) == 1:
+        (scan,) = scans
+
+        def first_pattern_rule(entry: LogEntry, patterns_only: bool) -> IgnoreRule | None:
+            hit = scan(entry, no_match)
+            return hit[1] if hit is not None else None
+
+        return first_pattern_rule
+
+    # Hashed hits before every pattern rule need no scan at all (configs
+    # usually list their TAG and LEVEL rules first)
+    first_pattern_position = min(
+        rules[0][0] for rules in (config.pattern_rules, config.linepattern_rules) if rules
+    )
+
+    def first_matching_rule(entry: LogEntry, patterns_only: bool) -> IgnoreRule | None:
+        best_position = no_match
+        best_rule: IgnoreRule | None = None
+
+        if has_hashed_rules and not patterns_only:
+            resolved = by_tag.get(entry.tag)
+            hit = (resolved if resolved is not None else level_index).get(entry.level)
+            if hit is not None:
+                best_position, best_rule = hit
+                if best_position < first_pattern_position:
+                    return best_rule
+
+        for scan in scans:
+            hit = scan(entry, best_position)
+            if hit is not None:
+                best_position, best_rule = hit
+
+        return best_rule
+
+    return first_matching_rule
+
+
+# Finds the first pattern rule of one kind positioned before a bound
+PatternScan = Callable[[LogEntry, int], PositionedRule | None]
+
+
+# One block of consecutive pattern rules: index of its first rule, its
+# literal screen, and its fused gate, named alternation and branch table
+# (all None when the block cannot be fused)
+FusedBlock = tuple[
+    int,
+    Callable[[str], bool] | None,
+    Pattern[str] | None,
+    Pattern[str] | None,
+    list[int] | None,
+]
+
+
+def _fused_blocks(rules: list[PositionedRule]) -> list[FusedBlock]:
+    """Fuse rules in consecutive blocks of PREFIX_BLOCK_SIZE.
+
+    A regex alternation is tried branch by branch at every position, so
+    one over hundreds of rules costs more per search than the rules' own
+    literal checks would. Blocks keep each search small, carry their own
+    literal screen so most are skipped with substring checks, and are all
+    built up front, so compile work is one pass over the rules however
+    many distinct matches the input produces.
+    """
+    blocks: list[FusedBlock] = []
+    sources = [rule.search_source for _, rule in rules]
+    for start in range(0, len(rules), PREFIX_BLOCK_SIZE):
+        block = sources[start:start + PREFIX_BLOCK_SIZE]
+        gate = _combine_search_forms(block, named=False)
+        named = _combine_search_forms(block)
+        screen = _literal_screen(rules[start:start + PREFIX_BLOCK_SIZE])
+        if gate is None or named is None:
+            blocks.append((start, screen, None, None, None))
+        else:
+            blocks.append(
+                (start, screen, gate, named, combined_branch_table(named, len(block)))
+            )
+    return blocks
+
+
+def _build_pattern_scan(
+    rules: list[PositionedRule],
+    screen: Callable[[str], bool] | None,
+    pattern_set: Callable[[str], int | None] | None,
+    combined: Pattern[str] | None,
+    gate: Pattern[str] | None,
+    by_line: bool,
+) -> PatternScan:
+    """Build the scan for one kind of pattern rule (PATTERN or LINEPATTERN).
+
+    The scan first skips entries whose text fails the literal screen. A
+    pattern set then reports the first matching rule outright. Otherwise
+    the combined regex must match, and it names one matching rule, so only
+    the rules before that one still need checking individually. The
+    group-free gate finds that match's position more cheaply, leaving the
+    combined regex a single anchored match() there. Kinds with more than
+    PREFIX_BLOCK_SIZE rules are scanned the same way one fused block at a
+    time, in order (see _fused_blocks). Without a combined regex, each
+    rule is tried in order. A handful of
+    plain-text rules are simply searched for in order: a few substring
+    tests cost less than starting the regex engine.
+    """
+    first_position = rules[0][0]
+
+    if len(rules) < PREFIX_FUSION_MIN_RULES and all(rule.is_literal for _, rule in rules):
+        literals = [(hit, hit[1].literal_hint) for hit in rules]
+
+        def scan_literals(entry: LogEntry, bound: int) -> PositionedRule | None:
+            text = entry.raw_line if by_line else entry.message
+            for hit, literal in literals:
+                if hit[0] >= bound:
+                    return None
+                if literal in text:
+                    return hit
+            return None
+
+        return scan_literals
+
+    if pattern_set is not None:
+
+        def scan_set(entry: LogEntry, bound: int) -> PositionedRule | None:
+            if first_position >= bound:
+                return None
+            text = entry.raw_line if by_line else entry.message
+            if screen is not None and not screen(text):
+                return None
+            index = pattern_set(text)
+            if index is None or rules[index][0] >= bound:
+                return None
+            return rules[index]
+
+        return scan_set
+
+    def first_checked(entry: LogEntry, start: int, stop: int) -> int:
+        # Index of the first rule in [start, stop) matching, else stop
+        for index in range(start, stop):
+            if rules[index][1].matches(entry):
+                return index
+        return stop
+
+    if len(rules) <= PREFIX_BLOCK_SIZE and combined is not None:
+        branches = combined_branch_table(combined, len(rules))
+
+        def scan_combined(entry: LogEntry, bound: int) -> PositionedRule | None:
+            if first_position >= bound:
+                return None
+            text = entry.raw_line if by_line else entry.message
+            if screen is not None and not screen(text):
+                return None
+            if gate is not None:
+                match = gate.search(text)
+                if match is None:
+                    return None
+                # Same start, so the same branch search() would report
+                match = combined.match(text, match.start())
+            else:
+                match = combined.search(text)
+                if match is None:
+                    return None
+            hit = rules[first_checked(entry, 0, branches[match.lastindex])]
+            return hit if hit[0] < bound else None
+
+        return scan_combined
+
+    if len(rules) > PREFIX_BLOCK_SIZE:
+        blocks = _fused_blocks(rules)
+
+        def scan_blocks(entry: LogEntry, bound: int) -> PositionedRule | None:
+            text = entry.raw_line if by_line else entry.message
+            if screen is not None and not screen(text):
+                return None
+            for start, block_screen, block_gate, named, branches in blocks:
+                if rules[start][0] >= bound:
+                    return None
+                if block_screen is not None and not block_screen(text):
+                    continue
+                end = min(start + PREFIX_BLOCK_SIZE, len(rules))
+                if block_gate is None:
+                    index = first_checked(entry, start, end)
+                    if index == end:
+                        continue
+                else:
+                    match = block_gate.search(text)
+                    if match is None:
+                        continue
+                    branch = branches[named.match(text, match.start()).lastindex]
+                    index = first_checked(entry, start, start + branch)
+                hit = rules[index]
+                return hit if hit[0] < bound else None
+            return None
+
+        return scan_blocks
+
+    def scan_each(entry: LogEntry, bound: int) -> PositionedRule | None:
+        if first_position >= bound:
+            return None
+        if screen is not None:
+            if not screen(entry.raw_line if by_line else entry.message):
+                return None
+        for hit in rules:
+            if hit[0] >= bound:
+                return None
+            if hit[1].matches(entry):
+                return hit
+        return None
+
+    return scan_each
+
 
 # --- Scope Configuration (simplified) ---
 
-@dataclass
+@dataclass(slots=True)
 class ScopeConfig:
     """Parsed .logcatscope configuration.
 
     Contains a set of tags that are considered "in scope" for your app.
-    In-scope logs are routed to the InScope output stream.
+    In-scope logs are routed to the InScope output stream. Tags are kept
+    as a frozenset (any iterable passed in is converted), so the set
+    consulted per line cannot change underneath the filter, and are
+    interned, so lookups of parsed tags match by identity.
     """
-    tags: set[str] = field(default_factory=set)
+    tags: frozenset[str] = field(default_factory=frozenset)
+
+    def __post_init__(self):
+        self.tags = frozenset(map(sys.intern, self.tags))
 
     def is_tag_in_scope(self, tag: str) -> bool:
         """Check if a tag is in scope."""
@@ -156,19 +870,22 @@ class ScopeConfig:
 
 # --- Routing ---
 
-class RouteCategory(Enum):
+class RouteCategory(IntEnum):
     """Categories for three-stream output routing.
 
     IN_SCOPE: Tag is in .logcatscope (your app's logs)
     IGNORED: Matches a rule in .logcatignore (known noise)
     NOISE: Everything else (unknown - refine over time)
+
+    Members are small consecutive ints, so per-category state can live in
+    a list indexed by category (and hashing is int hashing).
     """
-    IN_SCOPE = auto()
-    IGNORED = auto()
-    NOISE = auto()
+    IN_SCOPE = 0
+    IGNORED = 1
+    NOISE = 2
 
 
-@dataclass
+@dataclass(slots=True)
 class RouteResult:
     """Result of routing a log entry to an output stream."""
     entry: LogEntry
@@ -178,7 +895,7 @@ class RouteResult:
 
 # --- Filter Result (for backward compatibility) ---
 
-@dataclass
+@dataclass(slots=True)
 class FilterResult:
     """Result of filtering a log entry.
 
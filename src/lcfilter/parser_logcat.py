@@ -1,9 +1,11 @@
 """Parser for Android logcat output lines."""
 
+import codecs
 import re
+import sys
 from typing import Iterator
 
-from .models import LogEntry, LogLevel
+from .models import LEVELS_BY_CHAR, LogEntry, LogLevel
 
 
 # Common logcat formats:
@@ -65,12 +67,133 @@ PATTERNS = [
     PROCESS_PATTERN,
 ]
 
+# Fields a format pattern may capture, in LogEntry order after raw_line
+ENTRY_FIELDS = ("timestamp", "pid", "tid", "level", "tag", "message")
+
+
+# Opening of a named group in a format pattern's source
+_NAMED_GROUP = re.compile(r"\(\?P<(\w+)>")
+
+
+def _fuse_patterns(
+    patterns: list[re.Pattern[str]],
+) -> tuple[re.Pattern[str], dict[int, tuple[int, ...]]]:
+    """Combine the format patterns into one alternation.
+
+    Each format becomes a branch wrapped in its own group, with its named
+    groups renamed so they stay unique (f0_tag, f1_tag, ...). Branches are
+    tried in list order, so a single match() picks the same format the
+    sequential loop would. The wrapper is the outermost group of its
+    branch, so match.lastindex identifies the format.
+
+    A final branch that can never match holds one more group, which thus
+    never participates. Fields a format lacks map to it, so one
+    match.group(*indices) call returns all ENTRY_FIELDS, with None for
+    the absent ones.
+
+    Returns:
+        The fused pattern, and for each wrapper group index the group
+        indices of ENTRY_FIELDS in that format.
+    """
+    branches = [
+        "(" + _NAMED_GROUP.sub(rf"(?P<f{i}_\1>", pattern.pattern) + ")"
+        for i, pattern in enumerate(patterns)
+    ]
+    fused = re.compile("|".join(branches) + "|(?!)(?P<absent>)")
+    absent = fused.groupindex["absent"]
+
+    wrapper = 1
+    field_groups: dict[int, tuple[int, ...]] = {}
+    for i, pattern in enumerate(patterns):
+        field_groups[wrapper] = tuple(
+            fused.groupindex.get(f"f{i}_{name}", absent) for name in ENTRY_FIELDS
+        )
+        wrapper += pattern.groups + 1
+    return fused, field_groups
+
+
+FUSED_PATTERN, _FIELD_GROUPS = _fuse_patterns(PATTERNS)
+
+# Every format starts with a timestamp digit or a level letter, so lines
+# starting with anything else (or empty) are rejected without the regex.
+# This covers the ASCII digits; \d also accepts other Unicode decimal
+# digits, which _parse_line lets through with str.isdecimal()
+_FORMAT_FIRST_CHARS = frozenset("0123456789").union(LEVELS_BY_CHAR)
+
+
+# Maximum number of parsed lines kept for reuse
+PARSE_CACHE_SIZE = 4096
+
+# The cache hit rate is reviewed after this many lookups
+PARSE_CACHE_WINDOW = 1024
+
+# Windows with fewer hits than this stop new lines being cached
+PARSE_CACHE_MIN_HITS = PARSE_CACHE_WINDOW // 64
+
+# While not caching, every this many windows caching is retried
+PARSE_CACHE_RETRY_WINDOWS = 16
+
+
+class _ParseCache:
+    """Bounded cache of parsed lines that backs off when lines don't repeat.
+
+    Identical lines (brief/tag formats, chatty spam, repeated stack frames)
+    are common enough in logcat that reparsing them is wasted work, but
+    threadtime lines carry a timestamp and are usually unique. So the hit
+    rate is measured per window of lookups, and while it is too low new
+    lines are not inserted, which keeps unique lines from churning the
+    cache. When full, the cache is simply cleared.
+    """
+
+    __slots__ = ("entries", "lookups", "hits", "admitting", "idle_windows")
+
+    def __init__(self) -> None:
+        self.entries: dict[str, LogEntry] = {}
+        self.lookups = 0
+        self.hits = 0
+        self.admitting = True
+        self.idle_windows = 0
+
+    def get(self, line: str) -> LogEntry | None:
+        """Return the cached entry for a line, if any."""
+        entry = self.entries.get(line)
+        if entry is not None:
+            self.hits += 1
+
+        self.lookups += 1
+        if self.lookups == PARSE_CACHE_WINDOW:
+            self._review()
+        return entry
+
+    def put(self, line: str, entry: LogEntry) -> None:
+        """Cache a freshly parsed entry, if caching is currently worthwhile."""
+        if not self.admitting:
+            return
+        if len(self.entries) >= PARSE_CACHE_SIZE:
+            self.entries.clear()
+        self.entries[line] = entry
+
+    def _review(self) -> None:
+        """Decide whether to keep caching based on the last window's hits."""
+        if self.hits >= PARSE_CACHE_MIN_HITS:
+            self.admitting = True
+            self.idle_windows = 0
+        else:
+            self.idle_windows += 1
+            self.admitting = self.idle_windows % PARSE_CACHE_RETRY_WINDOWS == 0
+        self.lookups = 0
+        self.hits = 0
+
+
+_parse_cache = _ParseCache()
+
 
 def parse_logcat_line(line: str) -> LogEntry:
     """Parse a single logcat line into a LogEntry.
 
     Attempts to match against known logcat formats. If no format matches,
-    returns a LogEntry with only the raw_line set.
+    returns a LogEntry with only the raw_line set. Entries are immutable,
+    so repeated lines may return the same cached instance.
 
     Args:
         line: A single line from logcat output.
@@ -78,53 +201,111 @@ def parse_logcat_line(line: str) -> LogEntry:
     Returns:
         A LogEntry with parsed fields, or just raw_line if unparseable.
     """
-    line = line.rstrip("\n\r")
+    return _parse_stripped(line.rstrip("\n\r"))
+
 
-    for pattern in PATTERNS:
-        match = pattern.match(line)
-        if match:
-            return _build_entry_from_match(line, match)
+def _parse_stripped(line: str) -> LogEntry:
+    """parse_logcat_line() for a line known to have no terminator."""
+    entry = _parse_cache.get(line)
+    if entry is None:
+        entry = _parse_line(line)
+        _parse_cache.put(line, entry)
+    return entry
+
+
+def _parse_line(line: str) -> LogEntry:
+    """Parse a line with its terminator already stripped."""
+    first = line[:1]
+    if first not in _FORMAT_FIRST_CHARS and not first.isdecimal():
+        return LogEntry(line)
+
+    level = LEVELS_BY_CHAR.get(line[0])
+    if level is not None:
+        entry = _parse_level_first(line, level)
+        if entry is not None:
+            return entry
+
+    match = FUSED_PATTERN.match(line)
+    if match:
+        return _build_entry_from_match(line, match)
 
     # No pattern matched - return entry with just raw line
-    return LogEntry(raw_line=line)
+    return LogEntry(line)
+
+
+def _parse_level_first(line: str, level: LogLevel) -> LogEntry | None:
+    """Parse the brief, tag and process formats with string searches.
+
+    These are the formats starting with the level letter, and their fields
+    are delimited by single characters, so finding those is cheaper than
+    running the regex. The result is the one FUSED_PATTERN gives (lstrip()
+    and isdecimal() test the same characters as \\s and \\d); lines this
+    does not handle, including any containing a newline, return None and
+    are left to the regex.
+    """
+    if "\n" in line:
+        return None
+
+    separator = line[1:2]
+    if separator == "/":
+        # brief: "LEVEL/TAG(PID): message"; the tag runs to the first "("
+        open_paren = line.find("(", 2)
+        if open_paren > 2:
+            close_paren = line.find(")", open_paren)
+            if close_paren > 0 and line[close_paren + 1:close_paren + 2] == ":":
+                pid = line[open_paren + 1:close_paren].lstrip()
+                if pid.isdecimal():
+                    return LogEntry(
+                        line,
+                        None,
+                        int(pid),
+                        None,
+                        level,
+                        sys.intern(line[2:open_paren].strip()),
+                        line[close_paren + 2:].lstrip(),
+                    )
+
+        # tag: "LEVEL/TAG: message"; the tag runs to the first ":"
+        colon = line.find(":", 2)
+        if colon > 2:
+            return LogEntry(
+                line,
+                None,
+                None,
+                None,
+                level,
+                sys.intern(line[2:colon].strip()),
+                line[colon + 1:].lstrip(),
+            )
+    elif separator == "(":
+        # process: "LEVEL(PID) message"
+        close_paren = line.find(")", 2)
+        if close_paren > 0:
+            pid = line[2:close_paren].lstrip()
+            if pid.isdecimal():
+                return LogEntry(
+                    line, None, int(pid), None, level, None, line[close_paren + 1:].lstrip()
+                )
+    return None
 
 
 def _build_entry_from_match(raw_line: str, match: re.Match[str]) -> LogEntry:
-    """Build a LogEntry from a regex match."""
-    groups = match.groupdict()
-
-    # Parse level
-    level = None
-    if "level" in groups:
-        try:
-            level = LogLevel.from_str(groups["level"])
-        except ValueError:
-            pass
-
-    # Parse PID
-    pid = None
-    if "pid" in groups and groups["pid"]:
-        try:
-            pid = int(groups["pid"])
-        except ValueError:
-            pass
-
-    # Parse TID
-    tid = None
-    if "tid" in groups and groups["tid"]:
-        try:
-            tid = int(groups["tid"])
-        except ValueError:
-            pass
+    """Build a LogEntry from a FUSED_PATTERN match."""
+    timestamp, pid, tid, level, tag, message = match.group(
+        *_FIELD_GROUPS[match.lastindex]
+    )
 
+    # Positional, in field order: raw_line, timestamp, pid, tid, level,
+    # tag, message. Tags are interned so dict/set lookups against rule and
+    # scope tags (also interned) compare by identity.
     return LogEntry(
-        raw_line=raw_line,
-        timestamp=groups.get("timestamp"),
-        pid=pid,
-        tid=tid,
-        level=level,
-        tag=groups.get("tag", "").strip() if groups.get("tag") else None,
-        message=groups.get("message", ""),
+        raw_line,
+        timestamp,
+        int(pid) if pid else None,
+        int(tid) if tid else None,
+        LEVELS_BY_CHAR[level] if level else None,
+        sys.intern(tag.strip()) if tag else None,
+        message or "",
     )
 
 
@@ -137,20 +318,51 @@ def parse_logcat_lines(lines: Iterator[str]) -> Iterator[LogEntry]:
     Yields:
         LogEntry for each parsed line.
     """
-    for line in lines:
-        yield parse_logcat_line(line)
+    yield from map(parse_logcat_line, lines)
 
 
 def parse_logcat_text(text: str) -> list[LogEntry]:
     """Parse logcat text containing multiple lines.
 
+    This builds the list of lines and the list of entries up front. To
+    process large captures without holding either, use iter_logcat_text().
+
     Args:
         text: Multi-line logcat output.
 
     Returns:
         List of LogEntry objects.
     """
-    return list(parse_logcat_lines(iter(text.splitlines())))
+    # splitlines() already drops line terminators
+    return list(map(_parse_stripped, text.splitlines()))
+
+
+def iter_logcat_text(text: str) -> Iterator[LogEntry]:
+    """Parse logcat text lazily, one line at a time.
+
+    Lines are sliced out of the text as they are reached, so no list of
+    lines or entries is built. Lines end at "\n" (with an optional
+    preceding "\r"); unlike parse_logcat_text(), other characters that
+    str.splitlines() treats as line breaks stay part of the message.
+
+    Args:
+        text: Multi-line logcat output.
+
+    Yields:
+        LogEntry for each line.
+    """
+    find = text.find
+    start = 0
+    length = len(text)
+    while start < length:
+        end = find("\n", start)
+        if end == -1:
+            end = length
+        line = text[start:end]
+        if line.endswith("\r"):
+            line = line[:-1]
+        yield _parse_stripped(line)
+        start = end + 1
 
 
 class LogcatStreamParser:
@@ -160,12 +372,17 @@ class LogcatStreamParser:
     and multi-line log entries (like stack traces) in the future.
 
     Currently handles line-by-line parsing, but designed for extension.
+    Data may be fed as str or as raw bytes (decoded as UTF-8 with
+    replacement, including characters split across feeds). A partial
+    line is kept as a list of pieces and joined once, when its newline
+    arrives, so slowly dripping input is buffered in linear time.
     """
 
     def __init__(self) -> None:
-        self._buffer: str = ""
+        self._buffer: list[str] = []
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
 
-    def feed(self, data: str) -> Iterator[LogEntry]:
+    def feed(self, data: str | bytes) -> Iterator[LogEntry]:
         """Feed data to the parser and yield complete entries.
 
         Args:
@@ -174,12 +391,25 @@ class LogcatStreamParser:
         Yields:
             LogEntry for each complete line.
         """
-        self._buffer += data
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data)
+
+        if "\n" not in data:
+            if data:
+                self._buffer.append(data)
+            return
 
-        while "\n" in self._buffer:
-            line, self._buffer = self._buffer.split("\n", 1)
-            if line:  # Skip empty lines from split
-                yield parse_logcat_line(line)
+        lines = data.split("\n")
+        if self._buffer:
+            self._buffer.append(lines[0])
+            lines[0] = "".join(self._buffer)
+
+        # The text after the last newline is the next partial line
+        tail = lines.pop()
+        self._buffer = [tail] if tail else []
+
+        # Empty lines from split are skipped
+        yield from map(parse_logcat_line, filter(None, lines))
 
     def flush(self) -> LogEntry | None:
         """Flush any remaining buffered data.
@@ -187,9 +417,9 @@ class LogcatStreamParser:
         Returns:
             Final LogEntry if there's buffered data, None otherwise.
         """
-        if self._buffer.strip():
-            entry = parse_logcat_line(self._buffer)
-            self._buffer = ""
-            return entry
-        self._buffer = ""
+        self._buffer.append(self._decoder.decode(b"", final=True))
+        remaining = "".join(self._buffer)
+        self._buffer = []
+        if remaining.strip():
+            return parse_logcat_line(remaining)
         return None
@@ -0,0 +1,393 @@
+"""Regex engine selection and literal pre-screening for ignore rules."""
+
+import os
+import re
+import re._constants as _sre_constants
+import re._parser as _sre_parser
+from typing import Callable, Iterator, Pattern
+
+try:
+    import re2  # google-re2: linear-time DFA matching, optional
+except ImportError:
+    re2 = None
+
+try:
+    import ahocorasick  # pyahocorasick: multi-literal scanning, optional
+except ImportError:
+    ahocorasick = None
+
+
+# Environment variable used to pick the engine: "re2" or "re". The
+# standard library is used unless re2 is requested (and installed): re2
+# treats \w, \d and \b as ASCII-only and accepts slightly different
+# syntax, so installing it must not change what an ignore file matches.
+ENGINE_ENV_VAR = "LCFILTER_REGEX_ENGINE"
+
+SUPPORTED_ENGINES = ("re2", "re")
+
+
+def selected_engine() -> str:
+    """Return the name of the regex engine patterns will be compiled with.
+
+    Returns:
+        "re2" if explicitly requested and the module is installed,
+        otherwise "re".
+    """
+    requested = _requested_engine()
+    if requested == "re2" and re2 is not None:
+        return "re2"
+    return "re"
+
+
+def _requested_engine() -> str:
+    """The engine named in the environment, or "" if unset."""
+    return os.environ.get(ENGINE_ENV_VAR, "").strip().lower()
+
+
+# Maximum number of compiled patterns kept by compile_pattern()
+PATTERN_CACHE_SIZE = 512
+
+# Compiled patterns by source and the re2 module used (None for re)
+_compiled_patterns: dict[tuple[str, object], Pattern[str]] = {}
+
+
+def compile_pattern(pattern: str) -> Pattern[str]:
+    """Compile a regex with the selected engine, for use with search().
+
+    The pattern is always validated with the standard library first so
+    error messages are the same regardless of engine. If re2 is selected
+    but does not support the pattern (lookaround, backreferences, ...),
+    the standard library pattern is used instead. Leading and trailing
+    wildcards that cannot change whether search() finds a match are
+    dropped first (see search_equivalent). Results are cached, so
+    reloading a config or repeating a pattern does not compile again.
+
+    Args:
+        pattern: The regex source.
+
+    Returns:
+        A compiled pattern exposing search()/match()/fullmatch().
+
+    Raises:
+        re.error: If the pattern is not a valid regex.
+    """
+    use_re2 = selected_engine() == "re2"
+    key = (pattern, re2 if use_re2 else None)
+    compiled = _compiled_patterns.get(key)
+    if compiled is not None:
+        return compiled
+
+    re.compile(pattern)
+    compiled = _compile_source(search_equivalent(pattern), use_re2)
+    if len(_compiled_patterns) >= PATTERN_CACHE_SIZE:
+        _compiled_patterns.clear()
+    _compiled_patterns[key] = compiled
+    return compiled
+
+
+def compile_search_form(source: str) -> Pattern[str]:
+    """Compile a regex that is already in search-equivalent form.
+
+    Like compile_pattern(), but the source is compiled as given: there is
+    no separate validation pass and no wildcard stripping. Meant for
+    alternations fused from patterns that went through search_equivalent()
+    themselves, where parsing the whole alternation again would only cost
+    time. Results are not cached: each fused source is compiled once per
+    finalize(), and caching them would only push rule patterns out of the
+    compile_pattern() cache.
+
+    Args:
+        source: The regex source.
+
+    Returns:
+        A compiled pattern exposing search()/match()/fullmatch().
+
+    Raises:
+        re.error: If the source is not a valid regex.
+    """
+    return _compile_source(source, selected_engine() == "re2")
+
+
+def _compile_source(source: str, use_re2: bool) -> Pattern[str]:
+    """Compile a search-ready source, with re2 if selected and supported."""
+    compiled = re.compile(source)
+
+    if use_re2:
+        try:
+            compiled = re2.compile(source)
+        except Exception:
+            # re2 rejects features it cannot run in linear time
+            pass
+    return compiled
+
+
+_WILDCARD_REPEATS = (_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT)
+
+
+def _is_wildcard_run(item) -> bool:
+    """Whether a parsed item is `.*` or `.*?`."""
+    op, arg = item
+    if op not in _WILDCARD_REPEATS:
+        return False
+    low, high, body = arg
+    return low == 0 and high == _sre_constants.MAXREPEAT and list(body) == [
+        (_sre_constants.ANY, None)
+    ]
+
+
+def search_equivalent(pattern: str) -> str:
+    """Drop a top-level leading/trailing `.*` that search() makes redundant.
+
+    search() already tries every start position and stops as soon as the
+    rest of the pattern matches, so `.*X.*` finds a match exactly when `X`
+    does. The wildcards only cost time: a leading `.*` makes a failed
+    search quadratic in the line length.
+
+    Results are cached like required_literal()'s, since fusing rules
+    into combined regexes asks for the same sources again.
+
+    Args:
+        pattern: A valid regex source.
+
+    Returns:
+        The pattern without the redundant wildcards, or unchanged.
+    """
+    return _cached_analysis(_search_equivalents, pattern, _strip_redundant_wildcards)
+
+
+# search_equivalent() results by pattern source, bounded like _compiled_patterns
+_search_equivalents: dict[str, str | None] = {}
+
+
+def _strip_redundant_wildcards(pattern: str) -> str:
+    """Uncached implementation of search_equivalent()."""
+    try:
+        parsed = list(_sre_parser.parse(pattern))
+    except Exception:
+        return pattern
+
+    if len(parsed) < 2:
+        return pattern
+
+    if _is_wildcard_run(parsed[-1]):
+        for suffix in (".*?", ".*"):
+            if pattern.endswith(suffix):
+                pattern = pattern[: -len(suffix)]
+                break
+
+    if _is_wildcard_run(parsed[0]):
+        for prefix in (".*?", ".*"):
+            if pattern.startswith(prefix):
+                pattern = pattern[len(prefix):]
+                break
+
+    return pattern
+
+
+def build_pattern_set(patterns: list[str]) -> Callable[[str], int | None] | None:
+    """Compile regexes into a single multi-pattern matcher, if supported.
+
+    With re2 selected this is an RE2::Set: one linear-time pass over the
+    text reports every pattern that matches, so the lowest index is the
+    first matching pattern without trying any of them individually. The
+    set is only built when re2 is the selected engine, which takes an
+    explicit opt-in, so it matches like the rules' own compiled patterns
+    (see selected_engine()).
+
+    Args:
+        patterns: Source regexes, in rule order.
+
+    Returns:
+        A callable returning the index of the first pattern that matches
+        the text (or None), or None if no set engine is available or one
+        of the patterns is not supported by it.
+    """
+    if not patterns or selected_engine() != "re2":
+        return None
+
+    try:
+        pattern_set = re2.Set.SearchSet()
+        for pattern in patterns:
+            pattern_set.Add(search_equivalent(pattern))
+        pattern_set.Compile()
+    except Exception:
+        # Missing Set support, or a pattern re2 cannot compile
+        return None
+
+    def first_match(text: str) -> int | None:
+        matches = pattern_set.Match(text)
+        return min(matches) if matches else None
+
+    return first_match
+
+
+# Shorter literals match too often to be worth screening on
+MIN_HINT_LENGTH = 3
+
+
+# Required literals by pattern source, bounded like _compiled_patterns
+_literal_hints: dict[str, str | None] = {}
+
+
+def required_literal(pattern: str) -> str | None:
+    """Find a literal substring that every match of a regex must contain.
+
+    Literal runs are collected from the top level of the pattern and from
+    inside groups and repeats that must match at least once (but not from
+    alternations, optional parts or lookarounds), so the result is always
+    safe: if the literal is absent from a string, the regex cannot match
+    it. Case-insensitive patterns and groups yield no hint. Results are
+    cached alongside compiled patterns, so rebuilding a rule does not
+    parse its regex again.
+
+    Args:
+        pattern: The regex source.
+
+    Returns:
+        The longest required literal, or None if there is no usable one.
+    """
+    return _cached_analysis(_literal_hints, pattern, _find_required_literal)
+
+
+def _cached_analysis(
+    cache: dict[str, str | None], pattern: str, analyze: Callable[[str], str | None]
+) -> str | None:
+    """Look up or compute a per-pattern result, bounded like _compiled_patterns."""
+    try:
+        return cache[pattern]
+    except KeyError:
+        pass
+
+    result = analyze(pattern)
+    if len(cache) >= PATTERN_CACHE_SIZE:
+        cache.clear()
+    cache[pattern] = result
+    return result
+
+
+def _find_required_literal(pattern: str) -> str | None:
+    """Uncached implementation of required_literal()."""
+    try:
+        parsed = _sre_parser.parse(pattern)
+    except Exception:
+        return None
+
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+
+    best = max(_required_runs(parsed), key=len, default="")
+    return best if len(best) >= MIN_HINT_LENGTH else None
+
+
+_REQUIRED_REPEATS = (
+    _sre_constants.MAX_REPEAT,
+    _sre_constants.MIN_REPEAT,
+    _sre_constants.POSSESSIVE_REPEAT,
+)
+
+
+def _required_runs(parsed) -> Iterator[str]:
+    """Yield the literal runs that any match of a parsed sequence contains."""
+    run: list[str] = []
+    for op, arg in parsed:
+        if op is _sre_constants.LITERAL:
+            run.append(chr(arg))
+            continue
+
+        if run:
+            yield "".join(run)
+            run = []
+
+        if op is _sre_constants.SUBPATTERN:
+            _group, add_flags, _del_flags, body = arg
+            if not add_flags & re.IGNORECASE:
+                yield from _required_runs(body)
+        elif op is _sre_constants.ATOMIC_GROUP:
+            yield from _required_runs(arg)
+        elif op in _REQUIRED_REPEATS and arg[0] >= 1:
+            yield from _required_runs(arg[2])
+
+    if run:
+        yield "".join(run)
+
+
+# Anchored prefixes by pattern source
+_anchored_prefixes: dict[str, str | None] = {}
+
+_START_ANCHORS = (_sre_constants.AT_BEGINNING, _sre_constants.AT_BEGINNING_STRING)
+
+
+def anchored_prefix(pattern: str) -> str | None:
+    """Find the literal text a regex can only match at the start of a string.
+
+    For a pattern starting with `^` (or `\\A`) followed by literal
+    characters, such as the level prefix in `^E/.*Tag`, every match is at
+    position 0 and begins with those characters, so a string not starting
+    with them cannot match. Unlike required_literal() there is no minimum
+    length: a startswith() test is cheap and rejects most lines.
+
+    Args:
+        pattern: The regex source.
+
+    Returns:
+        The literal prefix, or None if the pattern is not anchored on one
+        (or is case-insensitive or multiline, where `^` can match later).
+    """
+    return _cached_analysis(_anchored_prefixes, pattern, _find_anchored_prefix)
+
+
+def _find_anchored_prefix(pattern: str) -> str | None:
+    """Uncached implementation of anchored_prefix()."""
+    try:
+        parsed = _sre_parser.parse(pattern)
+    except Exception:
+        return None
+
+    if parsed.state.flags & (re.IGNORECASE | re.MULTILINE):
+        return None
+
+    items = list(parsed)
+    if not items or items[0][0] is not _sre_constants.AT or items[0][1] not in _START_ANCHORS:
+        return None
+
+    prefix = []
+    for op, arg in items[1:]:
+        if op is not _sre_constants.LITERAL:
+            break
+        prefix.append(chr(arg))
+    return "".join(prefix) or None
+
+
+def build_literal_screen(literals: list[str]) -> Callable[[str], bool]:
+    """Build a function reporting whether any of the literals occur in a string.
+
+    Uses an Aho-Corasick automaton when pyahocorasick is installed (one
+    pass over the text regardless of literal count), otherwise a chain of
+    C-level substring searches.
+
+    Args:
+        literals: The literals to look for.
+
+    Returns:
+        A callable taking the text and returning True on any occurrence.
+    """
+    literals = list(dict.fromkeys(literals))
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for literal in literals:
+            automaton.add_word(literal, literal)
+        automaton.make_automaton()
+
+        def screen(text: str) -> bool:
+            for _ in automaton.iter(text):
+                return True
+            return False
+
+        return screen
+
+    if len(literals) == 1:
+        (literal,) = literals
+        return lambda text: literal in text
+
+    return lambda text: any(literal in text for literal in literals)
@@ -1,36 +1,101 @@
 """Output stream routing for three-stream filtering."""
 
+import io
+import os
+import queue
 import sys
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
 from pathlib import Path
-from typing import TextIO
+from typing import BinaryIO, Callable, TextIO
 
 from .models import RouteCategory
 
 
-@dataclass
+# Pending output for a stream is written once it reaches this many characters
+DEFAULT_BATCH_SIZE = 64 * 1024
+
+# ...or, for terminals and stdio, once this many seconds have passed
+# since the last flush
+DEFAULT_FLUSH_INTERVAL = 0.02
+
+# Lines written between checks of the clock against the flush interval
+CLOCK_CHECK_LINES = 64
+
+# Buffer size for files opened by the router, so each batch is written to
+# the OS in one call rather than in 8 KiB pieces
+FILE_BUFFER_SIZE = 1 << 20
+
+# Maximum number of writes queued for the background writer thread
+BACKGROUND_QUEUE_SIZE = 64
+
+
+class TargetKind(IntEnum):
+    """What kind of destination a StreamTarget path names."""
+    STDOUT = 0
+    STDERR = 1
+    DEVNULL = 2
+    FILE = 3
+
+
+# Special target paths; any other path is a file
+_SPECIAL_TARGETS = {
+    "stdout": TargetKind.STDOUT,
+    "-": TargetKind.STDOUT,
+    "/dev/stdout": TargetKind.STDOUT,
+    "stderr": TargetKind.STDERR,
+    "/dev/stderr": TargetKind.STDERR,
+    "/dev/null": TargetKind.DEVNULL,
+    os.devnull: TargetKind.DEVNULL,
+}
+
+# The path special targets are normalized to
+_CANONICAL_PATHS = {
+    TargetKind.STDOUT: "stdout",
+    TargetKind.STDERR: "stderr",
+    TargetKind.DEVNULL: "/dev/null",
+}
+
+# Where the null device resolves to, to catch other spellings of it
+_DEVNULL_REALPATH = os.path.realpath(os.devnull)
+
+
+@dataclass(frozen=True, slots=True)
 class StreamTarget:
     """Target for a single output stream.
 
+    Aliases of the special targets ("-", "/dev/stdout", "/dev/stderr")
+    are normalized to the names above.
+
     Attributes:
         path: Output path - "stdout", "stderr", "/dev/null", or file path
+        kind: The kind of destination, classified from path once.
     """
     path: str
+    kind: TargetKind = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        kind = _SPECIAL_TARGETS.get(self.path, TargetKind.FILE)
+        object.__setattr__(self, "kind", kind)
+        if kind is not TargetKind.FILE:
+            object.__setattr__(self, "path", _CANONICAL_PATHS[kind])
 
     def is_stdout(self) -> bool:
-        return self.path == "stdout"
+        return self.kind is TargetKind.STDOUT
 
     def is_stderr(self) -> bool:
-        return self.path == "stderr"
+        return self.kind is TargetKind.STDERR
 
     def is_devnull(self) -> bool:
-        return self.path == "/dev/null"
+        return self.kind is TargetKind.DEVNULL
 
     def is_file(self) -> bool:
-        return not (self.is_stdout() or self.is_stderr() or self.is_devnull())
+        return self.kind is TargetKind.FILE
 
 
-@dataclass
+@dataclass(slots=True)
 class RoutingConfig:
     """Configuration for three-stream routing.
 
@@ -76,9 +141,187 @@ class RoutingConfig:
         )
 
 
+class _NullSink:
+    """Stream stand-in for /dev/null that discards writes (bytes or text)."""
+
+    def write(self, data: bytes | str) -> int:
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+_NULL_SINK = _NullSink()
+
+
+class _TextStreamBytes:
+    """Binary stream adapter for a text stream without a byte buffer.
+
+    Used for sys.stdout/sys.stderr when they have been replaced by a
+    StringIO or similar: encoded batches are decoded and written as text.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def write(self, data: bytes) -> int:
+        self.stream.write(data.decode("utf-8", "replace"))
+        return len(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def _binary_stream(stream: TextIO) -> BinaryIO:
+    """The byte buffer under a text stream, or an adapter if it has none."""
+    buffer = getattr(stream, "buffer", None)
+    return buffer if buffer is not None else _TextStreamBytes(stream)
+
+
+def _discard_line(line: str) -> None:
+    """Line writer for categories routed to /dev/null."""
+
+
+def _is_interactive(target: StreamTarget, stream: BinaryIO) -> bool:
+    """Whether a stream is stdio or a terminal, so flushed on an interval."""
+    if target.is_stdout() or target.is_stderr():
+        return True
+    if stream is _NULL_SINK:
+        return False
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError, OSError):
+        return False
+
+
+def _close_quietly(f: BinaryIO) -> None:
+    """Close a file, ignoring errors."""
+    try:
+        f.close()
+    except Exception:
+        pass  # Ignore close errors
+
+
+def _write_now(stream: BinaryIO, data: bytes) -> None:
+    """Write encoded output to a stream on the calling thread."""
+    stream.write(data)
+
+
+class _BackgroundWriter:
+    """Performs stream writes, in order, on a separate thread.
+
+    The caller only queues the encoded data, so a slow destination (a
+    terminal, a pipe, a disk) does not hold up filtering; stream flushes
+    can be queued the same way (request_flush()). If a write or flush
+    fails, later writes are skipped and the error is raised from the
+    caller's next write() or flush().
+    """
+
+    def __init__(self, maxsize: int = BACKGROUND_QUEUE_SIZE) -> None:
+        # Items: (stream, data) to write, a list of streams to flush, an
+        # Event to set once every earlier item is done, or None to stop
+        self._queue: queue.Queue[
+            tuple[BinaryIO, bytes] | list[BinaryIO] | threading.Event | None
+        ] = queue.Queue(maxsize=maxsize)
+        self._error: BaseException | None = None
+        # A queued flush request not yet carried out, so idle and interval
+        # flushes do not pile up requests behind a slow stream
+        self._flush_requested = False
+        self._thread = threading.Thread(target=self._run, name="lcfilter-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, stream: BinaryIO, data: bytes) -> None:
+        """Queue data to be written to a stream."""
+        self._raise_error()
+        self._queue.put((stream, data))
+
+    def request_flush(self, streams: list[BinaryIO]) -> None:
+        """Queue a flush of the streams after the writes queued so far.
+
+        Returns without waiting; the writer thread flushes the streams.
+        """
+        self._raise_error()
+        if not self._flush_requested:
+            self._flush_requested = True
+            self._queue.put(streams)
+
+    def flush(self, streams: list[BinaryIO]) -> None:
+        """Wait until everything queued is written, then flush the streams."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        self._raise_error()
+        for stream in streams:
+            stream.flush()
+
+    def close(self) -> None:
+        """Finish the queued writes and stop the thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            if isinstance(item, threading.Event):
+                item.set()
+            elif isinstance(item, list):
+                self._flush_requested = False
+                if self._error is None:
+                    try:
+                        for stream in item:
+                            stream.flush()
+                    except BaseException as e:
+                        self._error = e
+            elif self._error is None:
+                stream, data = item
+                try:
+                    stream.write(data)
+                except BaseException as e:
+                    self._error = e
+
+
+class _PendingWrites:
+    """Lines waiting to be written to one output stream.
+
+    timed marks streams someone may be watching (stdout, stderr, a
+    terminal), which are flushed every flush_interval; files are left to
+    their buffers until flush() or exit.
+    """
+
+    __slots__ = ("stream", "lines", "size", "timed")
+
+    def __init__(self, stream: BinaryIO, timed: bool = False) -> None:
+        self.stream = stream
+        self.lines: list[str] = []
+        self.size = 0
+        self.timed = timed
+
+
 class StreamRouter:
     """Manages multiple output streams with automatic file handle lifecycle.
 
+    Writes are batched: lines accumulate per output stream and are written
+    in one call once the batch reaches batch_size characters, or when
+    flush() is called (e.g. whenever the input goes quiet). Batches for
+    stdout, stderr and terminals are also written and flushed once
+    flush_interval seconds have passed (the clock is checked every
+    CLOCK_CHECK_LINES lines); files are only flushed by flush() and on
+    exit, so their large buffers are not pushed to disk every interval.
+    Categories sharing a stream share a batch, so their relative order is
+    preserved.
+
+    Streams are written in binary (stdout and stderr via their byte
+    buffers, when they have them), and each batch is encoded to UTF-8 in
+    one go when it is written, so there is no per-line pass through a
+    text layer. With background_writes,
+    encoded batches are written, and streams flushed, by a separate thread
+    (see _BackgroundWriter). Timed flushes and flush(wait=False) only hand
+    the pending batches to it; flush() with wait (the default, and on
+    exit) still returns only once everything is out.
+
     Usage:
         config = RoutingConfig.default()
         with StreamRouter(config) as router:
@@ -87,66 +330,325 @@ class StreamRouter:
                 router.write(result.category, entry.raw_line)
     """
 
-    def __init__(self, config: RoutingConfig):
+    def __init__(
+        self,
+        config: RoutingConfig,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        background_writes: bool = False,
+    ):
         self.config = config
-        self._handles: dict[RouteCategory, TextIO] = {}
-        self._opened_files: list[TextIO] = []
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.background_writes = background_writes
+        # Per-category state, indexed by RouteCategory
+        self._handles: list[BinaryIO] = []
+        self._text_streams: list[TextIO] = []
+        self._pending: list[_PendingWrites] = []
+        self._timed_batches: list[_PendingWrites] = []
+        # Lines left until the next clock check, shared by all writers
+        self._clock_countdown = [CLOCK_CHECK_LINES]
+        self._discarded: list[bool] = []
+        self._writers: list[Callable[[str], None]] = []
+        self._entry_writers: list[Callable[[str], None]] = []
+        self._opened_files: list[BinaryIO] = []
+        self._background: _BackgroundWriter | None = None
+        self._write: Callable[[BinaryIO, bytes], None] = _write_now
+        self._last_flush = time.monotonic()
 
     def __enter__(self) -> "StreamRouter":
-        """Open all configured streams."""
-        self._handles[RouteCategory.IN_SCOPE] = self._open_stream(self.config.in_scope)
-        self._handles[RouteCategory.IGNORED] = self._open_stream(self.config.ignored)
-        self._handles[RouteCategory.NOISE] = self._open_stream(self.config.noise)
+        """Open all configured streams.
+
+        Categories with the same destination share one handle (and so one
+        batch), so a file named twice is opened, and truncated, only once.
+        Nothing is opened for /dev/null: lines for it are dropped in write().
+        """
+        targets = {
+            RouteCategory.IN_SCOPE: self.config.in_scope,
+            RouteCategory.IGNORED: self.config.ignored,
+            RouteCategory.NOISE: self.config.noise,
+        }
+        opened: dict[str, BinaryIO] = {}
+        text_streams: dict[int, TextIO] = {}
+        batches: dict[int, _PendingWrites] = {}
+        for category in RouteCategory:
+            target = targets[category]
+            key = os.path.realpath(target.path) if target.is_file() else target.path
+            stream = opened.get(key)
+            if stream is None:
+                stream = opened[key] = self._open_stream(target)
+            self._handles.append(stream)
+            self._text_streams.append(self._text_stream(target, stream, text_streams))
+            batch = batches.get(id(stream))
+            if batch is None:
+                batch = batches[id(stream)] = _PendingWrites(
+                    stream, timed=_is_interactive(target, stream)
+                )
+                if batch.timed:
+                    self._timed_batches.append(batch)
+            self._pending.append(batch)
+            self._discarded.append(stream is _NULL_SINK)
+        if self.background_writes:
+            self._background = _BackgroundWriter()
+            self._write = self._background.write
+        self._writers = [self._make_writer(category) for category in RouteCategory]
+        self._entry_writers = [
+            self._make_writer(category, unterminated=True) for category in RouteCategory
+        ]
+
+        self._clock_countdown[0] = CLOCK_CHECK_LINES
+        self._last_flush = time.monotonic()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Close any files we opened."""
-        for f in self._opened_files:
-            try:
-                f.close()
-            except Exception:
-                pass  # Ignore close errors
-        self._opened_files.clear()
-        self._handles.clear()
+        """Flush pending output and close any files we opened."""
+        try:
+            self.flush()
+        finally:
+            if self._background is not None:
+                self._background.close()
+                self._background = None
+                self._write = _write_now
+            self._close_files()
+            self._opened_files.clear()
+            self._handles.clear()
+            self._text_streams.clear()
+            self._pending.clear()
+            self._timed_batches.clear()
+            self._discarded.clear()
+            self._writers.clear()
+            self._entry_writers.clear()
         return False  # Don't suppress exceptions
 
-    def _open_stream(self, target: StreamTarget) -> TextIO:
+    def _close_files(self) -> None:
+        """Close the files we opened, flushing their buffers concurrently.
+
+        Each close writes out up to FILE_BUFFER_SIZE of buffered data, and
+        the write releases the GIL, so with several files the writes can
+        overlap instead of running one after another.
+        """
+        if len(self._opened_files) < 2:
+            for f in self._opened_files:
+                _close_quietly(f)
+            return
+
+        threads = [
+            threading.Thread(target=_close_quietly, args=(f,))
+            for f in self._opened_files
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _open_stream(self, target: StreamTarget) -> BinaryIO:
         """Open a stream based on target configuration."""
+        match target.kind:
+            case TargetKind.STDOUT:
+                # Text already written to sys.stdout must come out first
+                sys.stdout.flush()
+                return _binary_stream(sys.stdout)
+            case TargetKind.STDERR:
+                sys.stderr.flush()
+                return _binary_stream(sys.stderr)
+            case TargetKind.DEVNULL:
+                return _NULL_SINK
+            case _:
+                # Regular file, unless it is the null device spelled differently
+                if os.path.realpath(target.path) == _DEVNULL_REALPATH:
+                    return _NULL_SINK
+                path = Path(target.path)
+                f = open(path, "wb", buffering=FILE_BUFFER_SIZE)
+                self._opened_files.append(f)
+                return f
+
+    @staticmethod
+    def _text_stream(
+        target: StreamTarget, stream: BinaryIO, text_streams: dict[int, TextIO]
+    ) -> TextIO:
+        """The text stream get_stream() returns for a binary handle."""
         if target.is_stdout():
             return sys.stdout
-        elif target.is_stderr():
+        if target.is_stderr():
             return sys.stderr
-        elif target.is_devnull():
-            f = open("/dev/null", "w", encoding="utf-8")
-            self._opened_files.append(f)
-            return f
-        else:
-            # Regular file
-            path = Path(target.path)
-            f = open(path, "w", encoding="utf-8")
-            self._opened_files.append(f)
-            return f
+        if stream is _NULL_SINK:
+            return _NULL_SINK
+        text = text_streams.get(id(stream))
+        if text is None:
+            # Shared like the handle; write_through so nothing is held
+            # back in the wrapper once the caller flushes it
+            text = text_streams[id(stream)] = io.TextIOWrapper(
+                stream, encoding="utf-8", errors="replace", write_through=True
+            )
+        return text
 
     def get_stream(self, category: RouteCategory) -> TextIO:
-        """Get the output stream for a category."""
+        """Get the (text) output stream for a category.
+
+        Call flush() before writing to it directly, so the direct write
+        is not reordered ahead of batched lines.
+        """
+        return self._text_streams[category]
+
+    def get_binary_stream(self, category: RouteCategory) -> BinaryIO:
+        """Get the binary output stream batches for a category are written to.
+
+        For stdout and stderr this is their byte buffer. The same ordering
+        caveat as for get_stream() applies.
+        """
         return self._handles[category]
 
     def write(self, category: RouteCategory, line: str) -> None:
-        """Write a line to the appropriate stream.
+        """Queue a line for the appropriate stream.
 
         Args:
             category: The routing category
             line: The line to write (newline added if not present)
         """
-        stream = self._handles[category]
-        stream.write(line)
-        if not line.endswith('\n'):
-            stream.write('\n')
-        stream.flush()
+        self._writers[category](line)
+
+    def writer(self, category: RouteCategory) -> Callable[[str], None]:
+        """Return a function queueing lines for one category.
+
+        Calling it is the same as write(category, line), with the
+        per-category lookups already done, for use in hot loops. It is
+        only valid while the router is open.
+        """
+        return self._writers[category]
+
+    def entry_writer(self, category: RouteCategory) -> Callable[[str], None]:
+        """Return a function queueing entries' raw lines for one category.
+
+        Like writer(), but for LogEntry.raw_line values, which never end
+        with a line terminator (the parser strips it), so a newline is
+        always added without checking.
+        """
+        return self._entry_writers[category]
+
+    def _make_writer(
+        self, category: RouteCategory, unterminated: bool = False
+    ) -> Callable[[str], None]:
+        """Build the line writer for a category (see writer()).
+
+        With unterminated, lines are known to lack a newline.
+        """
+        if self._discarded[category]:
+            return _discard_line
+
+        batch = self._pending[category]
+        append = batch.lines.append  # the list is cleared, never replaced
+        batch_size = self.batch_size
+        flush_interval = self.flush_interval
+        write_batch = self._write_batch
+        write = self._write
+        monotonic = time.monotonic
+        # Without stdio or terminal streams there is nothing to flush on time
+        timed = bool(self._timed_batches)
+        countdown = self._clock_countdown
+
+        def write_direct(line: str, newline: bytes) -> None:
+            # Too big to be worth copying into a batch: write it directly,
+            # after whatever is already pending for the stream
+            write_batch(batch)
+            write(batch.stream, line.encode("utf-8", "replace"))
+            if newline:
+                write(batch.stream, newline)
+
+        def write_unterminated(line: str) -> None:
+            # The newline is queued as its own item rather than copying
+            # the line to append it; join() combines them
+            size = len(line) + 1
+            if size >= batch_size:
+                write_direct(line, b"\n")
+            else:
+                append(line)
+                append("\n")
+                batch.size += size
+                if batch.size >= batch_size:
+                    write_batch(batch)
+            if timed:
+                countdown[0] -= 1
+                if not countdown[0]:
+                    countdown[0] = CLOCK_CHECK_LINES
+                    if monotonic() - self._last_flush >= flush_interval:
+                        self._flush_timed()
+
+        if unterminated:
+            return write_unterminated
+
+        def write_line(line: str) -> None:
+            if line[-1:] != "\n":
+                write_unterminated(line)
+                return
+
+            size = len(line)
+            if size >= batch_size:
+                write_direct(line, b"")
+            else:
+                append(line)
+                batch.size += size
+                if batch.size >= batch_size:
+                    write_batch(batch)
+            if timed:
+                countdown[0] -= 1
+                if not countdown[0]:
+                    countdown[0] = CLOCK_CHECK_LINES
+                    if monotonic() - self._last_flush >= flush_interval:
+                        self._flush_timed()
+
+        return write_line
 
     def write_entry(self, category: RouteCategory, raw_line: str) -> None:
         """Write a log entry's raw line to the appropriate stream.
 
-        Alias for write() with clearer semantics for log entries.
+        Same as write(). Parsed LogEntry.raw_line values never carry a
+        line terminator; one trailing newline on any other line is dropped
+        before the written newline is added, so it is not doubled. Hot
+        loops writing parsed entries can use entry_writer() instead.
+        """
+        self._entry_writers[category](raw_line.removesuffix("\n"))
+
+    def flush(self, wait: bool = True) -> None:
+        """Write all pending lines and flush every stream.
+
+        Args:
+            wait: With background_writes, whether to wait until the lines
+                are written and the streams flushed. Without waiting, the
+                writer thread is only asked to flush once it gets there,
+                so the caller never blocks on a slow destination (beyond
+                the bounded queue filling up). Writes are always done by
+                the time flush() returns without background_writes.
         """
-        self.write(category, raw_line)
+        batches = {id(b): b for b in self._pending}.values()
+        for batch in batches:
+            self._write_batch(batch)
+        if self._background is not None:
+            streams = [batch.stream for batch in batches]
+            if wait:
+                self._background.flush(streams)
+            else:
+                self._background.request_flush(streams)
+        else:
+            for batch in batches:
+                batch.stream.flush()
+        self._last_flush = time.monotonic()
+
+    def _flush_timed(self) -> None:
+        """Write and flush the stdio and terminal batches, without waiting."""
+        batches = self._timed_batches
+        for batch in batches:
+            self._write_batch(batch)
+        streams = [batch.stream for batch in batches]
+        if self._background is not None:
+            self._background.request_flush(streams)
+        else:
+            for stream in streams:
+                stream.flush()
+        self._last_flush = time.monotonic()
+
+    def _write_batch(self, batch: _PendingWrites) -> None:
+        """Encode a batch's lines and write them to its stream in one call."""
+        if batch.lines:
+            self._write(batch.stream, "".join(batch.lines).encode("utf-8", "replace"))
+            batch.lines.clear()
+            batch.size = 0
@@ -1,5 +1,6 @@
 """Tests for .logcatignore config parsing."""
 
+import pickle
 import pytest
 from pathlib import Path
 import tempfile
@@ -18,7 +19,9 @@ from lcfilter.models import (
     IgnoreRulePattern,
     IgnoreRuleLinePattern,
     LogLevel,
+    combined_branch_table,
 )
+from lcfilter.parser_logcat import parse_logcat_line
 
 
 class TestParseIgnoreLine:
@@ -53,6 +56,12 @@ class TestParseIgnoreLine:
         assert isinstance(rule, IgnoreRuleTag)
         assert rule.tag == "MyTag"
 
+    def test_tag_rule_spaced_prefix(self):
+        """Whitespace around a mixed-case prefix should be ignored."""
+        rule = parse_ignore_line("Tag :MyTag", 1)
+        assert isinstance(rule, IgnoreRuleTag)
+        assert rule.tag == "MyTag"
+
     def test_level_rule(self):
         """LEVEL:V should parse to IgnoreRuleLevel."""
         for level_str, level in [
@@ -97,6 +106,16 @@ class TestParseIgnoreLine:
         assert isinstance(rule, IgnoreRuleLinePattern)
         assert rule.pattern_str == "^\\d{2}-\\d{2}.*MyTag"
 
+    def test_pattern_rule_keeps_compiled_regex(self):
+        """Parsed pattern rules should carry the regex compiled at parse time."""
+        rule = parse_ignore_line("PATTERN:GC.*freed", 1)
+        assert rule.compiled is not None
+        assert rule.compiled.pattern == "GC.*freed"
+
+        rule = parse_ignore_line("LINEPATTERN:^D/.*Noisy", 1)
+        assert rule.compiled is not None
+        assert rule.compiled.pattern == "^D/.*Noisy"
+
     def test_invalid_rule_type(self):
         """Unknown rule types should raise IgnoreParseError."""
         with pytest.raises(IgnoreParseError) as exc_info:
@@ -181,6 +200,137 @@ class TestParseIgnoreContent:
         config = parse_ignore_content(content)
         assert len(config.rules) == 2
 
+    def test_pattern_rules_are_combined(self):
+        """PATTERN and LINEPATTERN rules should be fused into one regex each."""
+        content = """
+        PATTERN:^GC freed
+        PATTERN:Job didn't exist
+        LINEPATTERN:\\bART\\b
+        TAG:chatty
+        """
+        config = parse_ignore_content(content)
+        assert config.combined_pattern is not None
+        assert config.combined_pattern.search("GC freed 12KB")
+        assert config.combined_pattern.search("Job didn't exist in JobStore")
+        assert not config.combined_pattern.search("Nothing to see")
+        assert config.combined_linepattern is not None
+        assert config.combined_linepattern.search("I/art: ART GC")
+
+    def test_pattern_gate_has_no_groups(self):
+        """The gate should fuse the same patterns without capturing groups."""
+        content = """
+        PATTERN:^GC freed
+        PATTERN:time: \\d+ms
+        """
+        config = parse_ignore_content(content)
+        assert config.pattern_gate is not None
+        assert config.pattern_gate.groups == 0
+        assert config.pattern_gate.search("load time: 12ms")
+        assert not config.pattern_gate.search("Nothing to see")
+        assert config.linepattern_gate is None
+
+    def test_branch_table_skips_inner_groups(self):
+        """lastindex of a combined match should map to its pattern's index."""
+        content = """
+        PATTERN:(GC) freed
+        PATTERN:time: (\\d+)ms
+        """
+        config = parse_ignore_content(content)
+        table = combined_branch_table(config.combined_pattern, 2)
+        match = config.combined_pattern.search("load time: 12ms")
+        assert table[match.lastindex] == 1
+        match = config.combined_pattern.search("GC freed 12KB")
+        assert table[match.lastindex] == 0
+
+    def test_anchored_prefixes_screen_rules_without_hints(self):
+        """Rules with only a short anchored prefix can still be screened."""
+        content = """
+        LINEPATTERN:^V/
+        LINEPATTERN:^D/.*NoisyTag
+        """
+        config = parse_ignore_content(content)
+        assert config.linepattern_screen is not None
+        assert config.linepattern_screen("V/Tag( 1): x") is True
+        assert config.linepattern_screen("I/NoisyTag( 1): x") is True
+        assert config.linepattern_screen("I/Other( 1): x") is False
+
+    def test_rule_indexes(self):
+        """Rules should be indexed by kind, keeping the first rule per key."""
+        content = """
+        TAG:chatty
+        LEVEL:V
+        TAGLEVEL:ActivityManager:I
+        TAG:chatty
+        PATTERN:GC
+        """
+        config = parse_ignore_content(content)
+        assert config.tag_index["chatty"] == (0, config.rules[0])
+        assert config.level_index[LogLevel.VERBOSE] == (1, config.rules[1])
+        assert config.taglevel_index["ActivityManager"][LogLevel.INFO][0] == 2
+        assert config.pattern_rules == [(4, config.rules[4])]
+
+    def test_backreference_patterns_not_combined(self):
+        """Patterns using group references should not be fused."""
+        content = """
+        PATTERN:(a)
+        PATTERN:(b)\\1
+        """
+        config = parse_ignore_content(content)
+        assert len(config.rules) == 2
+        assert config.combined_pattern is None
+
+
+    def test_rule_matcher_built_on_finalize(self):
+        """The rule matcher should reflect the rules present at finalize()."""
+        config = parse_ignore_content("")
+        entry = parse_logcat_line("I/chatty( 1234): uid=1000 expire 3 lines")
+        assert config.rule_matcher(entry, False) is None
+
+        config.add_rule(IgnoreRuleTag(tag="chatty"))
+        config.finalize()
+        assert config.rule_matcher(entry, False) is config.rules[0]
+        assert config.rule_matcher(entry, True) is None
+
+    def test_replaced_rules_rebuild_matcher(self):
+        """Assigning new rules should not leave a stale matcher behind."""
+        config = parse_ignore_content("TAG:chatty")
+        entry = parse_logcat_line("I/art( 1234): GC_CONCURRENT freed 1K")
+        config.finalize()
+        assert config.rule_matcher(entry, False) is None
+
+        config.rules = [*config.rules, IgnoreRuleTag(tag="art")]
+        config.finalize()
+        assert config.rule_matcher(entry, False) is config.rules[1]
+
+    def test_rules_edited_in_place_rebuild_matcher(self):
+        """Appending to or editing the rule list should be picked up."""
+        config = parse_ignore_content("TAG:chatty")
+        entry = parse_logcat_line("I/art( 1234): GC_CONCURRENT freed 1K")
+        config.finalize()
+        assert isinstance(config.rules, list)
+
+        config.rules.append(IgnoreRuleTag(tag="art"))
+        config.finalize()
+        assert config.rule_matcher(entry, False) is config.rules[1]
+
+        config.rules[1] = IgnoreRuleTag(tag="other")
+        config.finalize()
+        assert config.rule_matcher(entry, False) is None
+
+        config.rules[0] = IgnoreRulePattern(pattern_str="GC_")
+        config.finalize()
+        assert config.rule_matcher(entry, False) is config.rules[0]
+
+    def test_pickle_round_trip(self):
+        """A finalized config should pickle and match the same afterwards."""
+        config = parse_ignore_content("TAG:chatty\nPATTERN:GC_\\w+\nLINEPATTERN:^D/")
+        config.finalize()
+        copy = pickle.loads(pickle.dumps(config))
+        assert copy.rules == config.rules
+        entry = parse_logcat_line("I/art( 1234): GC_CONCURRENT freed 1K")
+        copy.finalize()
+        assert copy.rule_matcher(entry, False) == config.rules[1]
+
 
 class TestParseIgnoreFile:
     """Tests for parse_ignore_file function."""
@@ -196,6 +346,18 @@ class TestParseIgnoreFile:
             config = parse_ignore_file(Path(f.name))
             assert len(config.rules) == 2
 
+    def test_parse_file_error_line_number(self):
+        """Errors from files should report the line they occurred on."""
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".logcatignore", delete=False, newline=""
+        ) as f:
+            f.write("# header\r\nTAG:TestTag\r\n\r\nBOGUS:value\r\n")
+            f.flush()
+
+            with pytest.raises(IgnoreParseError) as exc_info:
+                parse_ignore_file(Path(f.name))
+            assert exc_info.value.line_number == 4
+
     def test_file_not_found(self):
         """Should raise FileNotFoundError for missing file."""
         with pytest.raises(FileNotFoundError):
@@ -0,0 +1,51 @@
+"""Tests for config file line reading."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from lcfilter.config_reader import iter_config_lines
+
+
+class TestIterConfigLines:
+    """Tests for iter_config_lines function."""
+
+    def test_reads_all_lines(self):
+        """Should yield every line with its terminator."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / ".logcatignore"
+            path.write_bytes(b"TAG:One\nTAG:Two\nLEVEL:V")
+
+            assert list(iter_config_lines(path)) == ["TAG:One\n", "TAG:Two\n", "LEVEL:V"]
+
+    def test_empty_file(self):
+        """Empty files cannot be mapped and should yield nothing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / ".logcatscope"
+            path.write_bytes(b"")
+
+            assert list(iter_config_lines(path)) == []
+
+    def test_decodes_utf8(self):
+        """Lines should be decoded as UTF-8."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / ".logcatignore"
+            path.write_bytes("PATTERN:café\r\n".encode("utf-8"))
+
+            assert list(iter_config_lines(path)) == ["PATTERN:café\r\n"]
+
+    def test_reads_non_regular_file(self):
+        """Files that cannot be mapped should be read and split the same way."""
+        r, w = os.pipe()
+        os.write(w, b"TAG:One\r\nTAG:Two")
+        os.close(w)
+
+        assert list(iter_config_lines(Path(f"/dev/fd/{r}"))) == ["TAG:One\r\n", "TAG:Two"]
+        os.close(r)
+
+    def test_file_not_found(self):
+        """Should raise FileNotFoundError for missing file."""
+        with pytest.raises(FileNotFoundError):
+            list(iter_config_lines(Path("/nonexistent/.logcatignore")))
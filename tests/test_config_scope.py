@@ -10,6 +10,7 @@ from lcfilter.config_scope import (
     generate_sample_scope_file,
     ScopeParseError,
 )
+from lcfilter.models import ScopeConfig
 
 
 class TestParseScopeContent:
@@ -19,6 +20,7 @@ class TestParseScopeContent:
         """Empty content should return config with empty tags."""
         config = parse_scope_content("")
         assert config.tags == set()
+        assert isinstance(config.tags, frozenset)
 
     def test_single_tag(self):
         """Should parse a single tag."""
@@ -152,6 +154,12 @@ Network
         config = parse_scope_content("")
         assert config.is_tag_in_scope("MyApp") is False
 
+    def test_tags_frozen_on_construction(self):
+        """Tags passed as any iterable should be stored as a frozenset."""
+        config = ScopeConfig(tags={"MyApp"})
+        assert isinstance(config.tags, frozenset)
+        assert config.is_tag_in_scope("MyApp") is True
+
 
 class TestParseScopeFile:
     """Tests for parse_scope_file function."""
@@ -167,6 +175,18 @@ class TestParseScopeFile:
             config = parse_scope_file(Path(f.name))
             assert config.tags == {"MyApp", "MyAppNetwork"}
 
+    def test_parse_file_error_line_number(self):
+        """Errors from files should report the line they occurred on."""
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".logcatscope", delete=False
+        ) as f:
+            f.write("# header\nMyApp\n\nBad Tag\n")
+            f.flush()
+
+            with pytest.raises(ScopeParseError) as exc_info:
+                parse_scope_file(Path(f.name))
+            assert exc_info.value.line_number == 4
+
     def test_file_not_found(self):
         """Should raise FileNotFoundError for missing file."""
         with pytest.raises(FileNotFoundError):
@@ -209,4 +229,4 @@ class TestGenerateSampleScopeFile:
 
             # Should not raise
             config = parse_scope_file(path)
-            assert isinstance(config.tags, set)
+            assert isinstance(config.tags, frozenset)
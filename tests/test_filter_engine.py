@@ -1,5 +1,9 @@
 """Tests for filter engine."""
 
+import pickle
+import sys
+import time
+
 import pytest
 
 from lcfilter.filter_engine import (
@@ -52,6 +56,12 @@ class TestIgnoreRuleMatching:
         entry = make_entry(tag="NoisyTag")
         assert rule.matches(entry) is True
 
+    def test_rule_tags_are_interned(self):
+        """Tags given to rules should be interned, like parsed tags."""
+        tag = "".join(["Noisy", "Tag"])
+        assert IgnoreRuleTag(tag=tag).tag is sys.intern(tag)
+        assert IgnoreRuleTagLevel(tag=tag, level=LogLevel.INFO).tag is sys.intern(tag)
+
     def test_tag_rule_no_match(self):
         """IgnoreRuleTag should not match different tags."""
         rule = IgnoreRuleTag(tag="NoisyTag")
@@ -106,6 +116,31 @@ class TestIgnoreRuleMatching:
         entry = make_entry(message="Everything is fine")
         assert rule.matches(entry) is False
 
+    def test_pattern_rule_literal_hint(self):
+        """Pattern rules should skip the regex when the required literal is absent."""
+        rule = IgnoreRulePattern(pattern_str="^GC.*freed")
+        assert rule.literal_hint == "freed"
+        assert rule.matches(make_entry(message="GC concurrent freed 1MB")) is True
+        assert rule.matches(make_entry(message="GC concurrent done")) is False
+
+    def test_literal_pattern_rule(self):
+        """Plain-text patterns should be recognized and matched as substrings."""
+        rule = IgnoreRulePattern(pattern_str="GC freed")
+        assert rule.is_literal is True
+        assert rule.matches(make_entry(message="art: GC freed 1MB")) is True
+        assert rule.matches(make_entry(message="GC concurrent freed")) is False
+
+        assert IgnoreRulePattern(pattern_str=r"time: \d+ms").is_literal is False
+        assert IgnoreRulePattern(pattern_str=r"a\.bc").is_literal is False
+        assert IgnoreRulePattern(pattern_str="^GC freed").is_literal is False
+
+    def test_linepattern_rule_anchored_prefix(self):
+        """Line patterns anchored on a level should check the prefix first."""
+        rule = IgnoreRuleLinePattern(pattern_str="^E/.*Tag")
+        assert rule.anchored_prefix == "E/"
+        assert rule.matches(make_entry(raw_line="E/Tag( 1): boom")) is True
+        assert rule.matches(make_entry(raw_line="D/Tag( 1): fine")) is False
+
     def test_linepattern_rule_matches(self):
         """IgnoreRuleLinePattern should match raw line."""
         rule = IgnoreRuleLinePattern(pattern_str="^D/.*NoisyTag")
@@ -172,6 +207,177 @@ class TestFilterEngine:
         assert result.should_display is False
         assert isinstance(result.matched_rule, IgnoreRuleLevel)
 
+    def test_first_match_wins_across_rule_kinds(self):
+        """Indexed lookups should keep file order between rule kinds."""
+        entry = make_entry(tag="MyTag", level=LogLevel.INFO, message="noisy text")
+
+        config = IgnoreConfig()
+        config.add_rule(IgnoreRulePattern(pattern_str="noisy"))
+        config.add_rule(IgnoreRuleTag(tag="MyTag"))
+        result = FilterEngine(ignore_config=config).filter_entry(entry)
+        assert isinstance(result.matched_rule, IgnoreRulePattern)
+
+        config = IgnoreConfig()
+        config.add_rule(IgnoreRuleTagLevel(tag="MyTag", level=LogLevel.INFO))
+        config.add_rule(IgnoreRuleLevel(level=LogLevel.INFO))
+        config.add_rule(IgnoreRulePattern(pattern_str="noisy"))
+        result = FilterEngine(ignore_config=config).filter_entry(entry)
+        assert isinstance(result.matched_rule, IgnoreRuleTagLevel)
+
+        config = IgnoreConfig()
+        config.add_rule(IgnoreRuleTag(tag="Other"))
+        config.add_rule(IgnoreRuleLinePattern(pattern_str="MyTag"))
+        config.add_rule(IgnoreRulePattern(pattern_str="noisy"))
+        result = FilterEngine(ignore_config=config).filter_entry(entry)
+        assert isinstance(result.matched_rule, IgnoreRuleLinePattern)
+
+    def test_hashed_rule_between_pattern_rules(self):
+        """A hashed hit after some pattern rules should still be checked against them."""
+        entry = make_entry(tag="MyTag", level=LogLevel.INFO, message="noisy text")
+
+        config = IgnoreConfig()
+        config.add_rule(IgnoreRuleLinePattern(pattern_str="absent"))
+        config.add_rule(IgnoreRuleTag(tag="MyTag"))
+        config.add_rule(IgnoreRulePattern(pattern_str="noisy"))
+        result = FilterEngine(ignore_config=config).filter_entry(entry)
+        assert isinstance(result.matched_rule, IgnoreRuleTag)
+
+        config = IgnoreConfig()
+        config.add_rule(IgnoreRuleLevel(level=LogLevel.DEBUG))
+        config.add_rule(IgnoreRulePattern(pattern_str="noisy"))
+        config.add_rule(IgnoreRuleLevel(level=LogLevel.INFO))
+        result = FilterEngine(ignore_config=config).filter_entry(entry)
+        assert isinstance(result.matched_rule, IgnoreRulePattern)
+
+    def test_earlier_pattern_wins_over_leftmost_match(self):
+        """An earlier PATTERN rule should win even if a later one matches further left."""
+        entry = make_entry(message="early text, late text")
+
+        config = IgnoreConfig()
+        config.add_rule(IgnoreRulePattern(pattern_str="late"))
+        config.add_rule(IgnoreRulePattern(pattern_str="early"))
+        result = FilterEngine(ignore_config=config).filter_entry(entry)
+        assert result.matched_rule is config.rules[0]
+
+        config = IgnoreConfig()
+        config.add_rule(IgnoreRulePattern(pattern_str="missing"))
+        config.add_rule(IgnoreRulePattern(pattern_str="late"))
+        result = FilterEngine(ignore_config=config).filter_entry(entry)
+        assert result.matched_rule is config.rules[1]
+
+    def test_first_match_among_literal_patterns(self):
+        """A few plain-text rules should keep first-match-wins order."""
+        config = IgnoreConfig()
+        config.add_rule(IgnoreRuleLinePattern(pattern_str="MyTag"))
+        config.add_rule(IgnoreRulePattern(pattern_str="late"))
+        config.add_rule(IgnoreRulePattern(pattern_str="early"))
+        config.add_rule(IgnoreRuleTag(tag="Other"))
+        engine = FilterEngine(ignore_config=config)
+
+        entry = make_entry(tag="Other", message="early late")
+        assert engine.filter_entry(entry).matched_rule is config.rules[1]
+        entry = make_entry(tag="Other", message="early")
+        assert engine.filter_entry(entry).matched_rule is config.rules[2]
+        entry = make_entry(tag="Other", message="neither")
+        assert engine.filter_entry(entry).matched_rule is config.rules[3]
+
+    def test_first_match_among_many_patterns(self):
+        """With many rules, narrowing a combined hit should keep rule order."""
+        config = IgnoreConfig()
+        for i in range(30):
+            config.add_rule(IgnoreRulePattern(pattern_str=f"word{i:02d}"))
+        engine = FilterEngine(ignore_config=config)
+
+        entry = make_entry(message="word25 word12 word03")
+        assert engine.filter_entry(entry).matched_rule is config.rules[3]
+        entry = make_entry(message="word29 word20 word15")
+        assert engine.filter_entry(entry).matched_rule is config.rules[15]
+
+    def test_many_patterns_compile_once(self, monkeypatch):
+        """Large rule sets should be fused once up front and stay fast to match."""
+        from lcfilter import models
+
+        compiles = []
+        compile_search_form = models.compile_search_form
+        monkeypatch.setattr(
+            models,
+            "compile_search_form",
+            lambda source: compiles.append(source) or compile_search_form(source),
+        )
+
+        count = 1000
+        config = IgnoreConfig(
+            rules=[IgnoreRulePattern(pattern_str=rf"wo(r|k)d{i}x\d+") for i in range(count)]
+        )
+        engine = FilterEngine(ignore_config=config)
+        config.finalize()
+        built = len(compiles)
+        assert built <= 2 * -(-count // models.PREFIX_BLOCK_SIZE) + 2
+
+        start = time.perf_counter()
+        for late in range(count // 2, count, 5):
+            early = late - count // 2
+            entry = make_entry(message=f"word{late}x1 then word{early}x2")
+            assert engine.filter_entry(entry).matched_rule is config.rules[early]
+        assert engine.filter_entry(make_entry(message="word999")).matched_rule is None
+        assert len(compiles) == built
+        assert time.perf_counter() - start < 5
+
+    def test_pattern_set_keeps_rule_order(self, monkeypatch):
+        """With a pattern set engine, first-match-wins should still hold."""
+        from lcfilter import regex_backend
+        from tests.test_regex_backend import FakeRe2
+
+        monkeypatch.setattr(regex_backend, "re2", FakeRe2())
+        monkeypatch.setenv(regex_backend.ENGINE_ENV_VAR, "re2")
+
+        config = IgnoreConfig()
+        config.add_rule(IgnoreRulePattern(pattern_str="early"))
+        config.add_rule(IgnoreRuleTag(tag="TestTag"))
+        config.add_rule(IgnoreRulePattern(pattern_str="late"))
+        config.finalize()
+        assert config.pattern_set is not None
+
+        engine = FilterEngine(ignore_config=config)
+        assert engine.filter_entry(make_entry(message="late")).matched_rule is config.rules[1]
+        assert engine.filter_entry(make_entry(message="late early")).matched_rule is config.rules[0]
+
+    def test_colliding_group_names_fall_back(self):
+        """User groups named like the combined regex's groups should still match."""
+        config = IgnoreConfig()
+        config.add_rule(IgnoreRulePattern(pattern_str="(?P<_r1>noisy)"))
+        config.add_rule(IgnoreRulePattern(pattern_str="text"))
+        entry = make_entry(message="noisy text")
+
+        result = FilterEngine(ignore_config=config).filter_entry(entry)
+        assert config.combined_pattern is None
+        assert result.matched_rule is config.rules[0]
+
+    def test_group_names_sharing_the_prefix(self):
+        """User groups that only start like the combined regex's groups should match."""
+        config = IgnoreConfig()
+        config.add_rule(IgnoreRulePattern(pattern_str="(?P<_rx>foo)"))
+        config.add_rule(IgnoreRulePattern(pattern_str="(?P<_r7>bar)"))
+        engine = FilterEngine(ignore_config=config)
+
+        assert engine.filter_entry(make_entry(message="a foo")).matched_rule is config.rules[0]
+        assert engine.filter_entry(make_entry(message="bar")).matched_rule is config.rules[1]
+        assert engine.filter_entry(make_entry(message="baz")).matched_rule is None
+        assert config.combined_pattern is not None
+
+    def test_rule_added_after_engine_creation(self):
+        """Rules added via add_rule() should apply to an existing engine."""
+        config = IgnoreConfig()
+        config.add_rule(IgnoreRulePattern(pattern_str="first"))
+
+        engine = FilterEngine(ignore_config=config)
+        assert engine.filter_entry(make_entry(message="second")).should_display is True
+
+        config.add_rule(IgnoreRulePattern(pattern_str="second"))
+        result = engine.filter_entry(make_entry(message="second"))
+        assert result.should_display is False
+        assert result.matched_rule.pattern_str == "second"
+
     def test_filter_entries_generator(self):
         """filter_entries should yield FilterResult for each entry."""
         config = IgnoreConfig()
@@ -210,6 +416,38 @@ class TestFilterEngine:
         assert visible[0].tag == "Visible1"
         assert visible[1].tag == "Visible2"
 
+    def test_filter_entries_matches_filter_entry(self):
+        """The batch path should give the same results as filter_entry()."""
+        ignore_config = IgnoreConfig()
+        ignore_config.add_rule(IgnoreRuleTag(tag="MyApp"))
+        ignore_config.add_rule(IgnoreRulePattern(pattern_str="GC freed"))
+        engine = FilterEngine(
+            ignore_config=ignore_config, scope_config=ScopeConfig(tags={"MyApp"})
+        )
+        entries = [
+            make_entry(tag="MyApp"),
+            make_entry(tag="MyApp", message="GC freed 1MB"),
+            make_entry(tag="Other", message="GC freed 2MB"),
+            make_entry(tag="Other"),
+            LogEntry(raw_line="unparseable"),
+        ]
+
+        assert list(engine.filter_entries(entries)) == [
+            engine.filter_entry(entry) for entry in entries
+        ]
+        assert list(engine.filter_and_yield_visible(entries)) == [
+            entry for entry in entries if engine.filter_entry(entry).should_display
+        ]
+
+    def test_filter_entries_without_rules(self):
+        """Without ignore rules, every entry should be displayed."""
+        engine = FilterEngine(scope_config=ScopeConfig(tags={"MyApp"}))
+        entries = [make_entry(tag="MyApp"), make_entry(tag="Other")]
+
+        results = list(engine.filter_entries(entries))
+        assert results == [engine.filter_entry(entry) for entry in entries]
+        assert all(r.should_display and r.matched_rule is None for r in results)
+
 
 class TestFilterEngineHooks:
     """Tests for FilterEngine pre/post filter hooks."""
@@ -273,6 +511,34 @@ class TestFilterEngineHooks:
         # Post-filter overrode the ignore rule
         assert result.should_display is True
 
+    def test_hooks_run_in_order(self):
+        """Pre-filters run in the order added, and post-filters see their results."""
+        calls = []
+
+        def pre(name: str, result: bool | None):
+            def hook(entry: LogEntry) -> FilterResult | None:
+                calls.append(name)
+                return None if result is None else FilterResult(entry, result)
+            return hook
+
+        def post(name: str):
+            def hook(result: FilterResult) -> FilterResult:
+                calls.append(name)
+                return result
+            return hook
+
+        engine = FilterEngine()
+        engine.add_pre_filter(pre("pre1", None))
+        engine.add_post_filter(post("post1"))
+        engine.add_pre_filter(pre("pre2", False))
+        engine.add_pre_filter(pre("pre3", True))
+        engine.add_post_filter(post("post2"))
+
+        result = engine.filter_entry(make_entry())
+
+        assert result.should_display is False
+        assert calls == ["pre1", "pre2", "post1", "post2"]
+
 
 class TestFilterStats:
     """Tests for FilterStats class."""
@@ -336,6 +602,79 @@ class TestFilterStats:
         stats = FilterStats()
         assert stats.filter_rate == 0.0
 
+    def test_merge(self):
+        """merge() should add another tracker's counts."""
+        rule = IgnoreRuleTag(tag="Test")
+        first = FilterStats()
+        first.record(FilterResult(entry=make_entry(), should_display=True))
+        first.record(
+            FilterResult(entry=make_entry(), should_display=False, matched_rule=rule)
+        )
+        second = FilterStats()
+        second.record(
+            FilterResult(entry=make_entry(), should_display=False, matched_rule=rule)
+        )
+
+        first.merge(second)
+
+        assert first.total_entries == 3
+        assert first.displayed_entries == 1
+        assert first.ignored_entries == 2
+        assert list(first.rule_match_counts.values()) == [2]
+
+    def test_equal_rules_share_a_key(self):
+        """Distinct but equal rule objects should be counted together."""
+        stats = FilterStats()
+        for _ in range(3):
+            stats.record(
+                FilterResult(
+                    entry=make_entry(),
+                    should_display=False,
+                    matched_rule=IgnoreRuleTag(tag="x"),
+                )
+            )
+
+        assert list(stats.rule_match_counts.values()) == [3]
+
+    def test_pickle_keeps_rule_counts(self):
+        """Pickled stats (from dry-run workers) should keep rule counts."""
+        stats = FilterStats()
+        stats.record(
+            FilterResult(
+                entry=make_entry(),
+                should_display=False,
+                matched_rule=IgnoreRulePattern(pattern_str="GC"),
+            )
+        )
+
+        restored = pickle.loads(pickle.dumps(stats))
+
+        assert restored.ignored_entries == 1
+        assert restored.rule_match_counts == stats.rule_match_counts
+
+    def test_counts_stay_writable(self):
+        """Callers should still be able to set and edit the counters."""
+        rule = IgnoreRuleTag(tag="Test")
+        stats = FilterStats()
+        stats.record(
+            FilterResult(entry=make_entry(), should_display=False, matched_rule=rule)
+        )
+        stats.total_entries = 10
+        counts = stats.rule_match_counts
+        assert stats.rule_match_counts is counts
+        counts["custom"] = 5
+
+        stats.record(
+            FilterResult(entry=make_entry(), should_display=False, matched_rule=rule)
+        )
+
+        assert stats.total_entries == 11
+        assert stats.rule_match_counts["custom"] == 5
+        assert stats.rule_match_counts[FilterStats._rule_key(rule)] == 2
+
+        stats.rule_match_counts = {}
+        assert stats.rule_match_counts == {}
+
     def test_summary(self):
         """Summary should include key information."""
         stats = FilterStats()
@@ -705,6 +1044,16 @@ class TestRouteEntry:
 
         assert result.category == RouteCategory.NOISE
 
+    def test_rule_added_after_empty_routing(self):
+        """Rules added to an initially empty config should be applied."""
+        config = IgnoreConfig()
+        engine = FilterEngine(ignore_config=config)
+        entry = make_entry(tag="chatty")
+        assert engine.route_entry(entry).category == RouteCategory.NOISE
+
+        config.add_rule(IgnoreRuleTag(tag="chatty"))
+        assert engine.route_entry(entry).category == RouteCategory.IGNORED
+
     def test_route_result_contains_entry(self):
         """RouteResult should contain the original entry."""
         engine = FilterEngine()
@@ -714,3 +1063,42 @@ class TestRouteEntry:
         assert result.entry is entry
         assert result.entry.tag == "TestTag"
         assert result.entry.message == "Test message"
+
+    def test_route_entries_matches_route_entry(self):
+        """route_entries() should route each entry like route_entry()."""
+        scope_config = ScopeConfig(tags={"MyApp"})
+        ignore_config = IgnoreConfig()
+        ignore_config.add_rule(IgnoreRuleTag(tag="chatty"))
+        ignore_config.add_rule(IgnoreRulePattern(pattern_str="GC freed"))
+
+        engine = FilterEngine(ignore_config=ignore_config, scope_config=scope_config)
+        entries = [
+            make_entry(tag="MyApp", message="GC freed 1MB"),
+            make_entry(tag="chatty"),
+            make_entry(tag="art", message="GC freed 2MB"),
+            make_entry(tag="SystemServer"),
+            LogEntry(raw_line="unparseable"),
+        ]
+
+        batch = list(engine.route_entries(entries))
+        single = [engine.route_entry(entry) for entry in entries]
+        assert batch == single
+        assert [r.category for r in batch] == [
+            RouteCategory.IN_SCOPE,
+            RouteCategory.IGNORED,
+            RouteCategory.IGNORED,
+            RouteCategory.NOISE,
+            RouteCategory.NOISE,
+        ]
+
+    def test_route_entries_without_rules(self):
+        """Without ignore rules, entries are either in scope or noise."""
+        engine = FilterEngine(scope_config=ScopeConfig(tags={"MyApp"}))
+        entries = [make_entry(tag="MyApp"), make_entry(tag="Other")]
+
+        batch = list(engine.route_entries(entries))
+        assert batch == [engine.route_entry(entry) for entry in entries]
+        assert [r.category for r in batch] == [
+            RouteCategory.IN_SCOPE,
+            RouteCategory.NOISE,
+        ]
@@ -1,11 +1,18 @@
 """Tests for logcat line parsing."""
 
+import sys
+
 import pytest
 
 from lcfilter.parser_logcat import (
+    FUSED_PATTERN,
+    PARSE_CACHE_WINDOW,
+    iter_logcat_text,
     parse_logcat_line,
     parse_logcat_text,
     LogcatStreamParser,
+    _ParseCache,
+    _build_entry_from_match,
 )
 from lcfilter.models import LogLevel
 
@@ -110,6 +117,24 @@ class TestParseLogcatLine:
         assert entry.raw_line == ""
         assert entry.level is None
 
+    def test_every_level_letter_starts_a_format(self):
+        """Lines starting with any level letter, including S, should be parsed."""
+        entry = parse_logcat_line("S/MyTag: silenced")
+        assert entry.level == LogLevel.SILENT
+        assert entry.tag == "MyTag"
+
+        line = "Something else entirely"
+        assert parse_logcat_line(line).raw_line == line
+        assert parse_logcat_line(line).level is None
+
+    def test_unicode_digit_timestamp(self):
+        """Lines starting with a non-ASCII digit should still reach the formats."""
+        line = "\u0660\u0661-15 10:30:45.123  1234  5678 D MyTag: hello"
+        entry = parse_logcat_line(line)
+        assert entry.level == LogLevel.DEBUG
+        assert entry.tag == "MyTag"
+        assert entry.message == "hello"
+
     def test_message_with_colon(self):
         """Messages containing colons should be preserved."""
         line = "D/MyTag( 1234): Key: value: nested"
@@ -129,6 +154,69 @@ class TestParseLogcatLine:
         assert entry.raw_line == "D/Tag( 1234): message"
         assert entry.message == "message"
 
+    def test_tag_is_interned(self):
+        """Parsed tags should be interned strings."""
+        entry = parse_logcat_line("D/" + "Interned" + "Tag( 1234): msg")
+        assert entry.tag is sys.intern("InternedTag")
+
+    def test_repeated_line_reuses_entry(self):
+        """Identical lines should return the cached entry."""
+        line = "I/chatty( 1234): uid=1000 expire 3 lines"
+        first = parse_logcat_line(line)
+        assert parse_logcat_line(line + "\n") is first
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            "D/MyTag( 1234): Hello",
+            "D/My Tag (\t12):   spaced",
+            "D/MyTag(12 ): not brief",
+            "D/MyTag(abc): tag format",
+            "D/My(Tag: tag with paren",
+            "D/Tag(12)x: no colon after pid",
+            "W( 42)  process",
+            "W(\u0663) arabic-indic digit",
+            "E/:empty tag",
+            "I/Tag:",
+        ],
+    )
+    def test_level_first_formats_match_regex(self, line):
+        """Brief, tag and process lines should parse as the format regex does."""
+        match = FUSED_PATTERN.match(line)
+        expected = _build_entry_from_match(line, match) if match else None
+        entry = parse_logcat_line(line)
+        if expected is None:
+            assert entry.level is None
+        else:
+            assert entry == expected
+
+
+class TestParseCache:
+    """Tests for the parsed-line cache."""
+
+    def test_stops_caching_unique_lines(self):
+        """A window without repeats should stop new lines being cached."""
+        cache = _ParseCache()
+        entry = parse_logcat_line("D/Tag( 1): message")
+        for i in range(PARSE_CACHE_WINDOW):
+            cache.get(f"line {i}")
+            cache.put(f"line {i}", entry)
+
+        assert cache.admitting is False
+        cache.put("one more", entry)
+        assert cache.get("one more") is None
+
+    def test_keeps_caching_repeated_lines(self):
+        """A window with repeats should keep the cache admitting."""
+        cache = _ParseCache()
+        entry = parse_logcat_line("D/Tag( 1): message")
+        for _ in range(PARSE_CACHE_WINDOW):
+            if cache.get("same") is None:
+                cache.put("same", entry)
+
+        assert cache.admitting is True
+        assert cache.get("same") is entry
+
 
 class TestParseLogcatText:
     """Tests for parse_logcat_text function."""
@@ -163,6 +251,19 @@ I/Tag3( 9999): Message 3"""
         assert entries[1].tag == "ThreadT"
 
 
+class TestIterLogcatText:
+    """Tests for iter_logcat_text function."""
+
+    def test_matches_parse_logcat_text(self):
+        """Should yield the same entries as parse_logcat_text."""
+        text = "D/Tag1( 1234): Message 1\r\n\nI/Tag2( 5678): Message 2\n"
+        assert list(iter_logcat_text(text)) == parse_logcat_text(text)
+
+    def test_empty_text(self):
+        """Empty text should yield nothing."""
+        assert list(iter_logcat_text("")) == []
+
+
 class TestLogcatStreamParser:
     """Tests for LogcatStreamParser class."""
 
@@ -225,3 +326,23 @@ class TestLogcatStreamParser:
 
         assert len(all_entries) == 1
         assert all_entries[0].tag == "Tag"
+
+    def test_feed_bytes(self):
+        """Bytes should be decoded, even with characters split across feeds."""
+        parser = LogcatStreamParser()
+        data = "D/Tag( 1234): café\n".encode("utf-8")
+        split = data.index(b"\xa9")
+
+        entries = list(parser.feed(data[:split])) + list(parser.feed(data[split:]))
+        assert len(entries) == 1
+        assert entries[0].message == "café"
+
+    def test_many_lines_with_partial_tail(self):
+        """A large feed should yield every full line and keep the tail."""
+        parser = LogcatStreamParser()
+        data = "".join(f"D/Tag( {i}): msg {i}\n" for i in range(1000)) + "D/Tag( 1): tail"
+
+        entries = list(parser.feed(data))
+        assert len(entries) == 1000
+        assert entries[-1].message == "msg 999"
+        assert parser.flush().message == "tail"
@@ -0,0 +1,249 @@
+"""Tests for regex engine selection."""
+
+import re
+
+import pytest
+
+from lcfilter import regex_backend
+from lcfilter.regex_backend import (
+    ENGINE_ENV_VAR,
+    anchored_prefix,
+    build_literal_screen,
+    build_pattern_set,
+    compile_pattern,
+    required_literal,
+    search_equivalent,
+    selected_engine,
+)
+
+
+class FakeRe2Set:
+    """Stand-in for re2.Set that matches each pattern with the re module."""
+
+    def __init__(self, unsupported: tuple[str, ...]):
+        self.patterns: list[re.Pattern[str]] = []
+        self.unsupported = unsupported
+
+    def Add(self, pattern: str) -> int:
+        if pattern in self.unsupported:
+            raise ValueError("unsupported")
+        self.patterns.append(re.compile(pattern))
+        return len(self.patterns) - 1
+
+    def Compile(self) -> None:
+        pass
+
+    def Match(self, text: str) -> list[int]:
+        # RE2 reports matches in no particular order
+        return [i for i, p in enumerate(self.patterns) if p.search(text)][::-1]
+
+
+class FakeRe2:
+    """Stand-in for the re2 module that records compiled patterns."""
+
+    def __init__(self, unsupported: tuple[str, ...] = ()):
+        self.compiled: list[str] = []
+        self.unsupported = unsupported
+        self.Set = self
+
+    def SearchSet(self) -> FakeRe2Set:
+        return FakeRe2Set(self.unsupported)
+
+    def compile(self, pattern: str):
+        if pattern in self.unsupported:
+            raise ValueError("unsupported")
+        self.compiled.append(pattern)
+        return re.compile(pattern)
+
+
+class TestSelectedEngine:
+    """Tests for selected_engine function."""
+
+    def test_falls_back_to_re_without_re2(self, monkeypatch):
+        """Without re2 installed, the stdlib engine should be used."""
+        monkeypatch.setattr(regex_backend, "re2", None)
+        monkeypatch.delenv(ENGINE_ENV_VAR, raising=False)
+        assert selected_engine() == "re"
+
+    def test_re2_requires_opt_in(self, monkeypatch):
+        """Installing re2 alone should not change the engine."""
+        monkeypatch.setattr(regex_backend, "re2", FakeRe2())
+        monkeypatch.delenv(ENGINE_ENV_VAR, raising=False)
+        assert selected_engine() == "re"
+
+    def test_env_var_selects_re2(self, monkeypatch):
+        """LCFILTER_REGEX_ENGINE=re2 should use re2 when it is installed."""
+        monkeypatch.setattr(regex_backend, "re2", FakeRe2())
+        monkeypatch.setenv(ENGINE_ENV_VAR, "re2")
+        assert selected_engine() == "re2"
+
+    def test_env_var_forces_re(self, monkeypatch):
+        """LCFILTER_REGEX_ENGINE=re should force the stdlib engine."""
+        monkeypatch.setattr(regex_backend, "re2", FakeRe2())
+        monkeypatch.setenv(ENGINE_ENV_VAR, "re")
+        assert selected_engine() == "re"
+
+
+class TestCompilePattern:
+    """Tests for compile_pattern function."""
+
+    def test_invalid_regex_raises_re_error(self, monkeypatch):
+        """Invalid patterns should raise re.error with any engine."""
+        monkeypatch.setattr(regex_backend, "re2", FakeRe2())
+        with pytest.raises(re.error):
+            compile_pattern("[invalid")
+
+    def test_uses_re2_when_selected(self, monkeypatch):
+        """Patterns should be compiled with re2 when it is selected."""
+        fake = FakeRe2()
+        monkeypatch.setattr(regex_backend, "re2", fake)
+        monkeypatch.setenv(ENGINE_ENV_VAR, "re2")
+
+        compiled = compile_pattern("GC.*freed")
+        assert fake.compiled == ["GC.*freed"]
+        assert compiled.search("GC concurrent freed")
+
+    def test_compiled_patterns_are_cached(self, monkeypatch):
+        """Compiling the same pattern again should reuse the result."""
+        fake = FakeRe2()
+        monkeypatch.setattr(regex_backend, "re2", fake)
+        monkeypatch.setenv(ENGINE_ENV_VAR, "re2")
+
+        first = compile_pattern("cached pattern")
+        assert compile_pattern("cached pattern") is first
+        assert fake.compiled == ["cached pattern"]
+
+    def test_unsupported_by_re2_falls_back(self, monkeypatch):
+        """Patterns re2 cannot compile should use the stdlib engine."""
+        fake = FakeRe2(unsupported=("(?<=a)b",))
+        monkeypatch.setattr(regex_backend, "re2", fake)
+        monkeypatch.setenv(ENGINE_ENV_VAR, "re2")
+
+        compiled = compile_pattern("(?<=a)b")
+        assert fake.compiled == []
+        assert compiled.search("ab")
+
+
+class TestBuildPatternSet:
+    """Tests for build_pattern_set function."""
+
+    def test_none_without_set_engine(self, monkeypatch):
+        """Without re2 there is no set engine."""
+        monkeypatch.setattr(regex_backend, "re2", None)
+        assert build_pattern_set(["GC", "freed"]) is None
+
+    def test_reports_first_matching_pattern(self, monkeypatch):
+        """The lowest matching index should be returned."""
+        monkeypatch.setattr(regex_backend, "re2", FakeRe2())
+        monkeypatch.setenv(ENGINE_ENV_VAR, "re2")
+
+        first_match = build_pattern_set(["late", "early", "missing"])
+        assert first_match("early text, late text") == 0
+        assert first_match("early only") == 1
+        assert first_match("nothing") is None
+
+    def test_re2_set_requires_opt_in(self, monkeypatch):
+        """An installed re2 should not build a set unless it is selected."""
+        monkeypatch.setattr(regex_backend, "re2", FakeRe2())
+        monkeypatch.delenv(ENGINE_ENV_VAR, raising=False)
+        assert build_pattern_set(["GC", "freed"]) is None
+
+    def test_unsupported_pattern_disables_set(self, monkeypatch):
+        """A pattern re2 cannot compile should disable the set."""
+        monkeypatch.setattr(regex_backend, "re2", FakeRe2(unsupported=("(?<=a)b",)))
+        monkeypatch.setenv(ENGINE_ENV_VAR, "re2")
+        assert build_pattern_set(["GC", "(?<=a)b"]) is None
+
+
+class TestSearchEquivalent:
+    """Tests for search_equivalent function."""
+
+    def test_strips_outer_wildcards(self):
+        """Leading and trailing .* should be dropped."""
+        assert search_equivalent(r".*\bART\b.*\bGC\b.*") == r"\bART\b.*\bGC\b"
+        assert search_equivalent(".*?freed") == "freed"
+
+    def test_keeps_meaningful_wildcards(self):
+        """Wildcards that affect matching should be kept."""
+        assert search_equivalent(".*") == ".*"
+        assert search_equivalent(".*a|b") == ".*a|b"
+        assert search_equivalent(r"a\.*") == r"a\.*"
+        assert search_equivalent(".*+x") == ".*+x"
+        assert search_equivalent("(?s).*x") == "(?s).*x"
+
+    def test_compiled_pattern_is_stripped(self):
+        """compile_pattern should compile the search-equivalent form."""
+        compiled = compile_pattern(".*GC freed.*")
+        assert compiled.pattern == "GC freed"
+        assert compiled.search("I/art: GC freed 1MB")
+
+
+class TestRequiredLiteral:
+    """Tests for required_literal function."""
+
+    def test_plain_literal(self):
+        """A literal pattern is its own hint."""
+        assert required_literal("Job didn't exist") == "Job didn't exist"
+
+    def test_longest_top_level_run(self):
+        """The longest literal run outside of any construct should be used."""
+        assert required_literal("^GC.*freed") == "freed"
+        assert required_literal(r"time: \d+ms") == "time: "
+
+    def test_literals_inside_required_groups(self):
+        """Groups and repeats that must match contribute their literals."""
+        assert required_literal("(?:Job didn't exist)") == "Job didn't exist"
+        assert required_literal(r"^(\w+: )?(?:timeout after)+ \d+") == "timeout after"
+        assert required_literal("(?:connection refused)?x") is None
+
+    def test_case_insensitive_group_has_no_hint(self):
+        """Scoped case-insensitive groups are not screened."""
+        assert required_literal("(?i:freed) x") is None
+
+    def test_alternation_has_no_hint(self):
+        """Top-level alternation has no literal common to all matches."""
+        assert required_literal("alpha|beta") is None
+
+    def test_case_insensitive_has_no_hint(self):
+        """Case-insensitive patterns cannot be screened case-sensitively."""
+        assert required_literal("(?i)freed") is None
+
+    def test_short_literal_ignored(self):
+        """Literals shorter than the minimum length are not worth screening."""
+        assert required_literal("a.b") is None
+
+    def test_hints_are_cached(self, monkeypatch):
+        """Asking again for the same pattern should not parse it again."""
+        assert required_literal("cached hint") == "cached hint"
+        monkeypatch.setattr(regex_backend, "_sre_parser", None)
+        assert required_literal("cached hint") == "cached hint"
+
+
+class TestAnchoredPrefix:
+    """Tests for anchored_prefix function."""
+
+    def test_literal_after_start_anchor(self):
+        """Literals right after ^ or \\A are the prefix."""
+        assert anchored_prefix("^E/.*NoisyTag") == "E/"
+        assert anchored_prefix(r"\AGC freed") == "GC freed"
+        assert anchored_prefix("^ab?") == "a"
+
+    def test_no_prefix(self):
+        """Unanchored, non-literal, multiline and case-insensitive patterns have none."""
+        assert anchored_prefix("E/.*NoisyTag") is None
+        assert anchored_prefix(r"^\d+") is None
+        assert anchored_prefix("^D/|^E/") is None
+        assert anchored_prefix("(?m)^D/") is None
+        assert anchored_prefix("(?i)^D/") is None
+
+
+class TestBuildLiteralScreen:
+    """Tests for build_literal_screen function."""
+
+    def test_screen_detects_any_literal(self, monkeypatch):
+        """The screen should report whether any literal occurs."""
+        monkeypatch.setattr(regex_backend, "ahocorasick", None)
+        screen = build_literal_screen(["freed", "JobStore"])
+        assert screen("GC freed 1MB") is True
+        assert screen("missing from JobStore") is True
+        assert screen("nothing here") is False
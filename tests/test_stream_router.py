@@ -1,12 +1,17 @@
 """Tests for stream router."""
 
+import io
+import sys
 import tempfile
+import time
 from pathlib import Path
 
 import pytest
 
 from lcfilter.stream_router import (
+    CLOCK_CHECK_LINES,
     StreamTarget,
+    TargetKind,
     RoutingConfig,
     StreamRouter,
 )
@@ -43,6 +48,21 @@ class TestStreamTarget:
         assert StreamTarget("stderr").is_file() is False
         assert StreamTarget("/dev/null").is_file() is False
 
+    def test_kind(self):
+        """The target kind should be classified from the path."""
+        assert StreamTarget("stdout").kind is TargetKind.STDOUT
+        assert StreamTarget("stderr").kind is TargetKind.STDERR
+        assert StreamTarget("/dev/null").kind is TargetKind.DEVNULL
+        assert StreamTarget("output.log").kind is TargetKind.FILE
+
+    def test_aliases_normalized(self):
+        """Conventional aliases should name the special targets."""
+        for alias in ("-", "/dev/stdout"):
+            assert StreamTarget(alias).is_stdout() is True
+            assert StreamTarget(alias) == StreamTarget("stdout")
+        assert StreamTarget("/dev/stderr").path == "stderr"
+        assert StreamTarget("./-").is_file() is True
+
 
 class TestRoutingConfig:
     """Tests for RoutingConfig class."""
@@ -106,6 +126,25 @@ class TestStreamRouter:
             router.write(RouteCategory.IGNORED, "test line")
             router.write(RouteCategory.NOISE, "test line")
 
+    def test_devnull_is_not_opened(self):
+        """Lines for /dev/null should be dropped without opening it."""
+        config = RoutingConfig.default()
+
+        with StreamRouter(config, flush_interval=60) as router:
+            router.write(RouteCategory.IGNORED, "dropped")
+            assert router._opened_files == []
+            assert router._pending[RouteCategory.IGNORED].lines == []
+            router.get_binary_stream(RouteCategory.IGNORED).write(b"also dropped")
+
+    def test_devnull_alias_is_not_opened(self):
+        """Other paths to the null device should be dropped the same way."""
+        config = RoutingConfig.from_options(ignored="/dev/../dev/null")
+
+        with StreamRouter(config, flush_interval=60) as router:
+            router.write(RouteCategory.IGNORED, "dropped")
+            assert router._opened_files == []
+            assert router._pending[RouteCategory.IGNORED].lines == []
+
     def test_write_to_file(self):
         """Writing to file should create file with content."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -174,6 +213,41 @@ class TestStreamRouter:
             assert "ignored line" in ignored_path.read_text()
             assert "noise line" in noise_path.read_text()
 
+    def test_all_files_closed_on_exit(self):
+        """Every opened file should be closed, with its buffer written."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = [Path(tmpdir) / f"{name}.log" for name in ("a", "b", "c")]
+            config = RoutingConfig.from_options(*map(str, paths))
+
+            with StreamRouter(config, flush_interval=60) as router:
+                files = list(router._opened_files)
+                for category in RouteCategory:
+                    router.write(category, "x" * 1000)
+
+            assert all(f.closed for f in files)
+            assert all(path.stat().st_size == 1001 for path in paths)
+
+    def test_categories_sharing_a_file_share_a_handle(self):
+        """A file named by two categories should be opened once, in order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "all.log"
+
+            config = RoutingConfig.from_options(
+                in_scope=str(output_path),
+                noise=str(Path(tmpdir) / "." / "all.log"),
+            )
+
+            with StreamRouter(config, flush_interval=60) as router:
+                assert router.get_stream(RouteCategory.IN_SCOPE) is router.get_stream(
+                    RouteCategory.NOISE
+                )
+                assert len(router._opened_files) == 1
+                router.write(RouteCategory.IN_SCOPE, "scope 1")
+                router.write(RouteCategory.NOISE, "noise 1")
+                router.write(RouteCategory.IN_SCOPE, "scope 2")
+
+            assert output_path.read_text() == "scope 1\nnoise 1\nscope 2\n"
+
     def test_get_stream(self):
         """get_stream() should return the stream for a category."""
         config = RoutingConfig.default()
@@ -183,6 +257,34 @@ class TestStreamRouter:
             assert stream is not None
             assert hasattr(stream, "write")
 
+    def test_get_stream_is_text(self):
+        """get_stream() should take text, in order with batched lines."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "output.log"
+
+            config = RoutingConfig.from_options(in_scope=str(output_path))
+
+            with StreamRouter(config, flush_interval=60) as router:
+                assert router.get_stream(RouteCategory.NOISE) is sys.stdout
+                router.write(RouteCategory.IN_SCOPE, "batched")
+                router.flush()
+                router.get_stream(RouteCategory.IN_SCOPE).write("direct\n")
+                router.get_binary_stream(RouteCategory.IN_SCOPE).write(b"bytes\n")
+
+            assert output_path.read_text() == "batched\ndirect\nbytes\n"
+
+    def test_stdout_without_buffer(self, monkeypatch):
+        """A text-only stdout (e.g. StringIO) should still receive lines."""
+        stdout = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", stdout)
+
+        with StreamRouter(RoutingConfig.default()) as router:
+            router.write(RouteCategory.NOISE, "noise 1")
+            router.write_entry(RouteCategory.IN_SCOPE, "scope \u00e9")
+            assert router.get_stream(RouteCategory.NOISE) is stdout
+
+        assert stdout.getvalue() == "noise 1\nscope \u00e9\n"
+
     def test_write_entry_alias(self):
         """write_entry() should be an alias for write()."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -196,6 +298,19 @@ class TestStreamRouter:
             content = output_path.read_text()
             assert "Test line" in content
 
+    def test_write_entry_terminated_line(self):
+        """write_entry() should not double a line's own trailing newline."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "output.log"
+
+            config = RoutingConfig.from_options(in_scope=str(output_path))
+
+            with StreamRouter(config) as router:
+                router.write_entry(RouteCategory.IN_SCOPE, "Line 1\n")
+                router.write_entry(RouteCategory.IN_SCOPE, "Line 2")
+
+            assert output_path.read_text() == "Line 1\nLine 2\n"
+
     def test_files_closed_on_exit(self):
         """Files should be closed when exiting context."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -211,3 +326,159 @@ class TestStreamRouter:
             # The router's internal list should be cleared
             assert len(router._opened_files) == 0
             assert len(router._handles) == 0
+
+    def test_writes_are_batched(self):
+        """Lines should be held until the batch is flushed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "output.log"
+
+            config = RoutingConfig.from_options(in_scope=str(output_path))
+
+            with StreamRouter(config, flush_interval=60) as router:
+                router.write(RouteCategory.IN_SCOPE, "Line 1")
+                assert output_path.read_text() == ""
+
+                router.flush()
+                assert output_path.read_text() == "Line 1\n"
+
+    def test_batch_size_triggers_write(self):
+        """A batch should be written once it reaches batch_size."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "output.log"
+
+            config = RoutingConfig.from_options(in_scope=str(output_path))
+
+            with StreamRouter(config, batch_size=10, flush_interval=60) as router:
+                router.write(RouteCategory.IN_SCOPE, "12345678")
+                router.write(RouteCategory.IN_SCOPE, "abc")
+                router.get_stream(RouteCategory.IN_SCOPE).flush()
+                assert output_path.read_text() == "12345678\nabc\n"
+
+    def test_large_line_written_after_pending_lines(self):
+        """A line bigger than a batch should go out directly, in order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "output.log"
+
+            config = RoutingConfig.from_options(in_scope=str(output_path))
+
+            with StreamRouter(config, batch_size=10, flush_interval=60) as router:
+                router.write(RouteCategory.IN_SCOPE, "abc")
+                router.write(RouteCategory.IN_SCOPE, "x" * 20)
+                router.get_stream(RouteCategory.IN_SCOPE).flush()
+                assert output_path.read_text() == "abc\n" + "x" * 20 + "\n"
+
+    def test_interval_flushes_stdout_not_files(self, capsys):
+        """The flush interval should apply to stdout but leave files buffered."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "output.log"
+
+            config = RoutingConfig.from_options(in_scope=str(output_path))
+
+            with StreamRouter(config, flush_interval=0) as router:
+                for _ in range(CLOCK_CHECK_LINES):
+                    router.write(RouteCategory.IN_SCOPE, "to file")
+                    router.write(RouteCategory.NOISE, "to stdout")
+                assert capsys.readouterr().out.startswith("to stdout\n")
+                assert output_path.read_text() == ""
+
+            assert output_path.read_text() == "to file\n" * CLOCK_CHECK_LINES
+
+    def test_writer_matches_write(self, capsys):
+        """writer() should queue lines like write() does."""
+        config = RoutingConfig.default()
+
+        with StreamRouter(config, flush_interval=60) as router:
+            write_noise = router.writer(RouteCategory.NOISE)
+            router.write(RouteCategory.NOISE, "noise 1")
+            write_noise("noise 2")
+            router.writer(RouteCategory.IGNORED)("dropped")
+
+        assert capsys.readouterr().out == "noise 1\nnoise 2\n"
+
+    def test_shared_stream_keeps_order(self, capsys):
+        """Categories routed to the same stream should stay in write order."""
+        config = RoutingConfig.default()
+
+        with StreamRouter(config, flush_interval=60) as router:
+            router.write(RouteCategory.IN_SCOPE, "scope 1")
+            router.write(RouteCategory.NOISE, "noise 1")
+            router.write(RouteCategory.IN_SCOPE, "scope 2")
+
+        assert capsys.readouterr().out == "scope 1\nnoise 1\nscope 2\n"
+
+    def test_background_writes(self):
+        """Background writes should produce the same output, in order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "output.log"
+
+            config = RoutingConfig.from_options(in_scope=str(output_path))
+
+            with StreamRouter(
+                config, batch_size=10, flush_interval=60, background_writes=True
+            ) as router:
+                router.write(RouteCategory.IN_SCOPE, "abc")
+                router.write(RouteCategory.IN_SCOPE, "x" * 20)
+                router.write(RouteCategory.IN_SCOPE, "12345678")
+                router.flush()
+                assert output_path.read_text() == "abc\n" + "x" * 20 + "\n12345678\n"
+                router.write(RouteCategory.IN_SCOPE, "last")
+
+            assert output_path.read_text().endswith("12345678\nlast\n")
+            assert router._background is None
+
+    def test_background_timed_flush_does_not_block(self, monkeypatch):
+        """Timed flushes should leave a slow stream to the writer thread."""
+
+        class SlowStream:
+            def __init__(self) -> None:
+                self.data = b""
+                self.flushes = 0
+
+            def write(self, data: bytes) -> int:
+                self.data += data
+                return len(data)
+
+            def flush(self) -> None:
+                time.sleep(0.2)
+                self.flushes += 1
+
+        class SlowStdout:
+            def __init__(self, buffer: SlowStream) -> None:
+                self.buffer = buffer
+
+            def flush(self) -> None:
+                pass
+
+        slow = SlowStream()
+        monkeypatch.setattr(sys, "stdout", SlowStdout(slow))
+
+        router = StreamRouter(
+            RoutingConfig.default(), flush_interval=0, background_writes=True
+        )
+        with router:
+            start = time.perf_counter()
+            for i in range(200):
+                router.write(RouteCategory.NOISE, f"line {i}")
+            router.flush(wait=False)
+            elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.15
+        assert slow.flushes >= 2
+        assert slow.data == b"".join(b"line %d\n" % i for i in range(200))
+
+    def test_background_write_error_raised_on_flush(self):
+        """A failed background write should be raised to the caller."""
+
+        class FailingStream:
+            def write(self, data: bytes) -> int:
+                raise BrokenPipeError
+
+            def flush(self) -> None:
+                pass
+
+        router = StreamRouter(RoutingConfig.default(), background_writes=True)
+        with pytest.raises(BrokenPipeError):
+            with router:
+                router._pending[RouteCategory.NOISE].stream = FailingStream()
+                router.write(RouteCategory.NOISE, "lost")
+                router.flush()